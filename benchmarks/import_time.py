@@ -0,0 +1,56 @@
+"""
+Measures cold import time with `python -X importtime` in a fresh interpreter. Exits with an error when a
+module exceeds its budget or eagerly imports modules it should only load on demand.
+
+    python -m benchmarks.import_time [scale]
+
+Budgets are in milliseconds and can be scaled for slower machines, e.g. `python -m benchmarks.import_time 2`.
+"""
+import subprocess
+import sys
+
+BUDGETS = {
+    "serverless": (25, ("troposphere", "yaml", "serverless.service")),
+    "serverless.cli": (300, ("boto3", "troposphere")),
+    "serverless.provider": (250, ("serverless.aws.functions.http", "serverless.aws.functions.appsync", "strawberry")),
+}
+
+
+def measure(module, repeat=5):
+    best, loaded = None, set()
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+        )
+
+        timings = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative) / 1000
+
+        loaded = set(timings)
+        best = timings[module] if best is None else min(best, timings[module])
+
+    return best, loaded
+
+
+if __name__ == "__main__":
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    failures = []
+
+    for module, (budget, forbidden) in BUDGETS.items():
+        duration, loaded = measure(module)
+        print(f"{module:<30}{duration:>10.1f}ms{budget * scale:>10.0f}ms")
+
+        if duration > budget * scale:
+            failures.append(f"{module} took {duration:.1f}ms, budget is {budget * scale:.0f}ms")
+
+        for name in loaded.intersection(forbidden):
+            failures.append(f"{module} eagerly imports {name}")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
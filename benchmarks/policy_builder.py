@@ -0,0 +1,36 @@
+"""
+Appends thousands of statements (half of them duplicates) to a PolicyBuilder. Exits with an error when
+doubling the number of statements more than triples the time, which means append is no longer O(1).
+
+    python -m benchmarks.policy_builder [statements]
+"""
+import sys
+
+from benchmarks.synthetic import best_of
+from serverless.aws.iam import PolicyBuilder
+
+
+def build_policy(statements):
+    builder = PolicyBuilder()
+    for i in range(statements):
+        builder.allow(
+            ["sqs:SendMessage"], [f"arn:aws:sqs:${{aws:region}}:${{aws:accountId}}:queue-{i}"], sid=f"Queue{i}"
+        )
+        builder.allow(
+            ["sqs:SendMessage"], [f"arn:aws:sqs:${{aws:region}}:${{aws:accountId}}:queue-{i}"], sid=f"Queue{i}"
+        )
+
+    return builder
+
+
+if __name__ == "__main__":
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    single = best_of(lambda: build_policy(statements))
+    double = best_of(lambda: build_policy(statements * 2))
+
+    print(f"{statements:<20}{single:>10.3f}s")
+    print(f"{statements * 2:<20}{double:>10.3f}s")
+
+    if double / single > 3:
+        raise SystemExit(f"PolicyBuilder.append scales worse than linear ({double / single:.1f}x)")
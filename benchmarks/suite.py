@@ -0,0 +1,245 @@
+"""
+Builds and renders synthetic services of increasing size, measuring build time, render time and peak memory.
+
+    python -m benchmarks.suite [--scenario NAME] [--output results.json] [--compare baseline.json]
+
+Results saved with --output can be used as a baseline for --compare, which exits with an error when any metric
+regresses by more than --tolerance (20% by default).
+
+Individual optimisations are compared against their unoptimised variant with --case NAME.
+"""
+import argparse
+import hashlib
+import io
+import json
+import tracemalloc
+
+from benchmarks.synthetic import TRIGGERS, best_of, build_service
+
+SCENARIOS = {
+    "small": dict(functions=50, tables=5, queues=5, streams=5, machines=2, states=20, triggers=TRIGGERS),
+    "medium": dict(functions=250, tables=20, queues=20, streams=10, machines=5, states=50, triggers=TRIGGERS),
+    "large": dict(functions=1000, tables=50, queues=50, streams=20, machines=10, states=100, triggers=TRIGGERS),
+}
+
+METRICS = ("build", "render", "memory")
+
+
+def render(service):
+    service.dump(io.StringIO())
+
+
+def peak_memory(options):
+    tracemalloc.start()
+    try:
+        render(build_service(**options))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(options):
+    service = build_service(**options)
+
+    return dict(
+        build=best_of(lambda: build_service(**options)),
+        render=best_of(lambda: render(service)),
+        memory=peak_memory(options),
+    )
+
+
+# Comparison cases, each returns timings of its variants with the unoptimised one first
+CASES = {}
+
+
+def case(func):
+    CASES[func.__name__.replace("_", "-")] = func
+
+    return func
+
+
+@case
+def sid_cache(functions=500, tables=20):
+    from serverless.aws import iam
+
+    permissions = ["dynamodb:GetItem", "dynamodb:Query", "dynamodb:Scan", "dynamodb:BatchGetItem"]
+
+    def grant():
+        if hasattr(iam.anonymous_sid, "cache_clear"):
+            iam.anonymous_sid.cache_clear()
+
+        for _ in range(functions):
+            builder = iam.PolicyBuilder()
+            for index in range(tables):
+                builder.allow(permissions, [f"arn:aws:dynamodb:${{aws:region}}:${{aws:accountId}}:table/table-{index}"])
+
+    cached = best_of(grant)
+
+    originals = iam.freeze, iam.anonymous_sid
+    iam.freeze = lambda value: value
+    iam.anonymous_sid = lambda statement: "Policy" + hashlib.sha224(json.dumps(statement).encode("ascii")).hexdigest()
+    try:
+        uncached = best_of(grant)
+    finally:
+        iam.freeze, iam.anonymous_sid = originals
+
+    return dict(uncached=uncached, cached=cached)
+
+
+@case
+def yaml_dumper(functions=400):
+    import yaml
+
+    from serverless.service.types import Dumper
+
+    service = build_service(functions=functions)
+    service.pre_render()
+
+    def dump(dumper):
+        buf = io.StringIO()
+        for key, value in service.sections():
+            yaml.dump({key: value}, buf, Dumper=dumper, sort_keys=False, indent=2, width=1000)
+
+        return buf.getvalue()
+
+    if dump(yaml.Dumper) != dump(Dumper.sync()):
+        raise SystemExit("Output of yaml.Dumper and Dumper differs")
+
+    python = best_of(lambda: dump(yaml.Dumper))
+    native = best_of(lambda: dump(Dumper.sync()))
+
+    return {"yaml.Dumper": python, Dumper.__base__.__name__: native}
+
+
+@case
+def json_output(functions=400):
+    from serverless.service.types import orjson
+
+    service = build_service(functions=functions)
+
+    as_yaml = best_of(lambda: service.dump(io.StringIO()))
+    as_json = best_of(lambda: service.dump_json(io.StringIO()))
+
+    return {"yaml": as_yaml, "json (orjson)" if orjson else "json": as_json}
+
+
+@case
+def identifier(functions=500):
+    from serverless.service import types
+
+    conversions = ("underscore", "camel_case", "pascal_case", "snake_case", "spinal_case", "resource_case")
+
+    def per_function():
+        def build_and_render():
+            for name in conversions:
+                if hasattr(getattr(types, name), "cache_clear"):
+                    getattr(types, name).cache_clear()
+
+            render(build_service(functions=functions))
+
+        return best_of(build_and_render) / functions
+
+    cached = per_function()
+
+    originals = {name: getattr(types, name) for name in conversions}
+    for name, conversion in originals.items():
+        setattr(types, name, conversion.__wrapped__)
+
+    try:
+        uncached = per_function()
+    finally:
+        for name, conversion in originals.items():
+            setattr(types, name, conversion)
+
+    return {"uncached/function": uncached, "cached/function": cached}
+
+
+@case
+def schema_cache(types=300):
+    from typing import List
+
+    from aws_lambda_powertools.event_handler import AppSyncResolver
+    from pydantic import create_model
+
+    from serverless.service.plugins.appsync import builder
+
+    app = AppSyncResolver()
+    models = []
+    for index in range(types):
+        nested = {"parent": (models[-1] | None, None)} if models else {}
+        model = create_model(f"Model{index}", id=(str, ...), name=(str, ...), size=(int, 0), **nested)
+        models.append(model)
+
+        def resolver(id: str):
+            pass
+
+        resolver.__annotations__["return"] = List[model]
+        app.resolver(type_name="Query", field_name=f"list{index}")(resolver)
+
+    def generate(clear):
+        for cache in clear:
+            cache.clear()
+
+        builder.SchemaBuilder(app, namespace="bench").render(io.StringIO())
+
+    return {
+        "cold": best_of(lambda: generate([builder._schemas, builder._converted])),
+        "converted types": best_of(lambda: generate([builder._schemas])),
+        "cached schema": best_of(lambda: generate([])),
+    }
+
+
+def run_cases(names):
+    print(f"{'case':<16}{'variant':<20}{'time':>12}")
+    for name in names:
+        timings = CASES[name]()
+        for variant, duration in timings.items():
+            print(f"{name:<16}{variant:<20}{duration * 1000:>10.3f}ms")
+
+        first, *_, last = timings.values()
+        print(f"{name:<16}{'speedup':<20}{first / last:>11.1f}x")
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, metrics in results.items():
+        for metric in METRICS:
+            previous = baseline.get(name, {}).get(metric)
+            if previous and metrics[metric] > previous * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {previous:.4g} -> {metrics[metric]:.4g}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenarios to run, defaults to all")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Baseline JSON to compare results against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--case", action="append", choices=CASES, help="Comparison cases to run instead of scenarios")
+    args = parser.parse_args()
+
+    if args.case:
+        run_cases(args.case)
+        raise SystemExit()
+
+    results = {}
+    print(f"{'scenario':<12}{'functions':>10}{'build':>12}{'render':>12}{'peak memory':>14}")
+    for name in args.scenario or SCENARIOS:
+        results[name] = measure(SCENARIOS[name])
+        print(
+            f"{name:<12}{SCENARIOS[name]['functions']:>10}{results[name]['build']:>11.3f}s"
+            f"{results[name]['render']:>11.3f}s{results[name]['memory'] / 2 ** 20:>12.1f}MB"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+        if regressions:
+            raise SystemExit("Regressions:\n" + "\n".join(regressions))
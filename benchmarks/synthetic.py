@@ -0,0 +1,115 @@
+"""
+Synthetic service generator shared by benchmarks.
+
+Functions cycle through the given trigger types, each granted access to one of the tables, queues and streams.
+AppSync functions are not generated, as they import resolver modules relative to the builder script.
+"""
+import time
+
+from troposphere.dynamodb import AttributeDefinition, KeySchema, StreamSpecification
+
+from serverless import Configuration, Service
+from serverless.aws.features.encryption import Encryption
+from serverless.aws.features.stepfunctions import Iterator, Task
+from serverless.aws.features.xray import XRay
+from serverless.aws.functions.http import HTTPFunction
+from serverless.aws.iam.dynamodb import DynamoDBWriter
+from serverless.aws.iam.sqs import SQSPublisher
+from serverless.aws.resources.dynamodb import Table
+from serverless.aws.resources.kinesis import KinesisStream
+from serverless.aws.resources.sqs import Queue
+from serverless.provider import AWSProvider
+from serverless.service.plugins.iam_roles import IAMRoles
+from serverless.service.plugins.python_requirements import PythonRequirements
+
+TRIGGERS = ("http", "sqs", "kinesis", "dynamodb_stream", "event_bridge", "s3", "websocket", "generic")
+
+
+def add_function(service, trigger, index, table, queue, stream):
+    name, description = f"{trigger.replace('_', '-')}-{index}", "Synthetic function"
+    build = service.builder.function
+
+    if trigger == "http":
+        return build.http(name, description, f"/items/{index}", HTTPFunction.POST)
+    if trigger == "sqs":
+        return build.sqs(name, description, queue.arn())
+    if trigger == "kinesis":
+        return build.kinesis(stream.arn(), name, description)
+    if trigger == "dynamodb_stream":
+        return build.dynamodb_stream({"Fn::GetAtt": [table.resource.title, "StreamArn"]}, name, description)
+    if trigger == "event_bridge":
+        return build.event_bridge(name, description, "synthetic-bus", {"source": [f"synthetic.{index}"]})
+    if trigger == "s3":
+        return build.s3(name, description, f"synthetic-bucket-{index}", "s3:ObjectCreated:*")
+    if trigger == "websocket":
+        return build.websocket(name, description)
+
+    return build.generic(name, description)
+
+
+def add_machine(service, index, functions, states):
+    machine = service.stepFunctions.machine(f"machine-{index}", "Synthetic state machine")
+
+    for step in range(states - 1):
+        fn = functions[(index + step) % len(functions)]
+        if step % 10 == 9:
+            machine.map(f"map-{step}", Iterator(f"map-{step}", [Task(fn)], auto_fallback=True))
+        else:
+            machine.task(fn, name=f"task-{step}")
+
+    machine.task(functions[index % len(functions)], name="last", end=True)
+
+    return machine
+
+
+def build_service(functions=100, tables=10, queues=10, streams=0, machines=0, states=20, triggers=("http",)):
+    service = Service(
+        "benchmark-service", "Synthetic service", AWSProvider(), config=Configuration(domain="example.com")
+    )
+    service.plugins.add(PythonRequirements())
+    service.plugins.add(IAMRoles())
+    service.enable(XRay())
+    service.enable(Encryption())
+
+    all_tables = [
+        service.resources.add(
+            Table(
+                f"Table{i}",
+                BillingMode="PAY_PER_REQUEST",
+                AttributeDefinitions=[AttributeDefinition(AttributeName="id", AttributeType="S")],
+                KeySchema=[KeySchema(AttributeName="id", KeyType="HASH")],
+                StreamSpecification=StreamSpecification(StreamViewType="NEW_IMAGE"),
+            )
+        )
+        for i in range(tables)
+    ]
+    all_queues = [service.resources.add(Queue(f"queue-{i}")) for i in range(queues)]
+    all_streams = [service.resources.add(KinesisStream(f"stream-{i}")) for i in range(streams)]
+
+    all_functions = []
+    for i in range(functions):
+        table, queue = all_tables[i % tables], all_queues[i % queues]
+        stream = all_streams[i % streams] if streams else None
+        trigger = triggers[i % len(triggers)]
+        if trigger == "kinesis" and not stream:
+            trigger = "generic"
+
+        fn = add_function(service, trigger, i, table, queue, stream)
+        fn.iam.apply(DynamoDBWriter(table.resource))
+        fn.iam.apply(SQSPublisher(queue.arn()))
+        all_functions.append(fn)
+
+    for i in range(machines):
+        add_machine(service, i, all_functions, states)
+
+    return service
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
@@ -1,2 +1,9 @@
-from serverless.service import Service
-from serverless.service.configuration import Configuration
+from serverless.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Service": ("serverless.service", "Service"),
+        "Configuration": ("serverless.service.configuration", "Configuration"),
+    },
+)
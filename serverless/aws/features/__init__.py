@@ -1,3 +1,12 @@
-from .api_handler import DefaultFourHundredResponse
-from .api_keys import ApiKeys
-from .xray import XRay
+from serverless.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "DefaultFourHundredResponse": ("serverless.aws.features.api_handler", "DefaultFourHundredResponse"),
+        "ApiKeys": ("serverless.aws.features.api_keys", "ApiKeys"),
+        "PolicyCompaction": ("serverless.aws.features.iam", "PolicyCompaction"),
+        "StackBudget": ("serverless.aws.features.budget", "StackBudget"),
+        "XRay": ("serverless.aws.features.xray", "XRay"),
+    },
+)
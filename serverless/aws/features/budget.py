@@ -0,0 +1,171 @@
+import json
+import os
+import shutil
+import warnings
+
+from serverless.service.plugins.python_requirements import PythonRequirements
+from serverless.service.plugins.scriptable import Scriptable
+from serverless.service.plugins.split_stacks import SplitStacks
+from serverless.service.types import Feature, to_plain
+
+LIMITS = dict(resources=500, outputs=200, template_bytes=1024 * 1024)
+
+# Resources serverless framework adds for every event of a function, e.g. ApiGateway::Method and Lambda::Permission
+EVENT_RESOURCES = dict(http=2, websocket=3, sqs=1, stream=1, eventBridge=2, schedule=2, s3=2)
+
+# Rough size of a resource generated by serverless framework in the compiled template
+GENERATED_RESOURCE_BYTES = 600
+
+# Hook removing version outputs serverless framework adds for every function
+VERSION_OUTPUTS_HOOK = "after:package:compileFunctions"
+VERSION_OUTPUTS_SCRIPT = "drop_version_outputs.js"
+
+
+class StackLimitException(Exception):
+    pass
+
+
+def drops_version_outputs(service):
+    hooks = service.plugins.get(Scriptable) and service.custom.get("scriptHooks") or {}
+    hook = hooks.get(VERSION_OUTPUTS_HOOK) or []
+
+    return VERSION_OUTPUTS_SCRIPT in ([hook] if isinstance(hook, str) else hook)
+
+
+def estimate(service):
+    """
+    Estimates size of the compiled CloudFormation stack: resources and outputs defined by the builder plus
+    those serverless framework and plugins generate for functions, events, layers and state machines.
+    """
+    versioned = service.provider.get("versionFunctions", True) is not False
+    version_outputs = versioned and not drops_version_outputs(service)
+    generated, outputs = 1, len(service.resources.outputs) + 1
+    paths = set()
+    apis = set()
+
+    if not service.provider.get("deploymentBucket"):
+        generated += 2
+
+    plugin = service.plugins.get(PythonRequirements)
+    if plugin and plugin.get("layer"):
+        generated += 1
+        outputs += 1
+
+    for fn in service.functions.all():
+        generated += 1 + versioned + bool(fn.iamRoleStatements) + bool(fn.get("destinations"))
+        outputs += version_outputs
+
+        for event in fn.events:
+            generated += EVENT_RESOURCES.get(event.yaml_tag, 1)
+
+            if event.yaml_tag in ("http", "websocket"):
+                apis.add(event.yaml_tag)
+
+            if event.yaml_tag == "http":
+                segments = [segment for segment in event.path.split("/") if segment]
+                paths.update("/".join(segments[: index + 1]) for index in range(len(segments)))
+
+    # RestApi and Deployment for http, Api, Deployment and Stage for websocket, each with an endpoint output
+    generated += len(paths) + 2 * ("http" in apis) + 3 * ("websocket" in apis)
+    outputs += len(apis)
+    generated += 2 * len(service.stepFunctions.stateMachines)
+
+    defined = len(service.resources.all())
+    template = json.dumps(to_plain(service.resources), separators=(",", ":"))
+
+    return dict(
+        resources=defined + generated,
+        outputs=outputs,
+        template_bytes=len(template) + generated * GENERATED_RESOURCE_BYTES,
+        defined_resources=defined,
+        defined_template_bytes=len(template),
+        generated_resources=generated,
+    )
+
+
+class StackBudget(Feature):
+    """
+    Checks estimated stack size against CloudFormation limits while rendering, warning when a limit is close and
+    raising StackLimitException when it is exceeded. Reductions are opt-in: with split, serverless-plugin-split-stacks
+    moves function resources into nested stacks; with reduce_outputs, function ARN exports are kept only for
+    functions listed in function_exports and version outputs are removed after packaging.
+
+    Enable it after other features, so resources they add on render are accounted for.
+    """
+
+    def __init__(self, threshold=0.8, split=False, nested_stack_count=10, reduce_outputs=False, function_exports=()):
+        super().__init__()
+        self.threshold = threshold
+        self.split = split
+        self.nested_stack_count = nested_stack_count
+        self.reduce_outputs = reduce_outputs
+        self.function_exports = set(function_exports)
+        self.report = None
+
+    def enable(self, service):
+        if self.split and not service.plugins.has(SplitStacks):
+            service.plugins.add(SplitStacks(nestedStackCount=self.nested_stack_count))
+
+        if self.reduce_outputs and service.provider.get("versionFunctions", True) is not False:
+            self.drop_version_outputs(service)
+
+    def pre_render(self, service):
+        super().pre_render(service)
+
+        if self.reduce_outputs:
+            self.drop_function_exports(service)
+
+        self.report = estimate(service)
+        for name, value in self.report.items():
+            service.profiler.count(f"stack.{name}", value)
+
+        for name, limit in LIMITS.items():
+            value = self.report[name]
+            if name in ("resources", "template_bytes") and self.split:
+                # Generated function resources move to nested stacks, defined ones stay in the root stack
+                value = self.report[f"defined_{name}"]
+
+            if value <= limit * self.threshold:
+                continue
+
+            message = f"Estimated stack {name} ({value}) exceed CloudFormation limit of {limit}"
+            if name in ("resources", "template_bytes") and not self.split:
+                message += ", see StackBudget(split=True)"
+            elif name == "outputs" and not self.reduce_outputs:
+                message += ", see StackBudget(reduce_outputs=True)"
+
+            if value > limit:
+                raise StackLimitException(message)
+
+            warnings.warn(message.replace("exceed", "are close to", 1))
+
+    def drop_function_exports(self, service):
+        """
+        Removes ARN exports of functions not listed in function_exports.
+        """
+        removed = []
+        for fn in service.functions.all():
+            if str(fn.key) not in self.function_exports:
+                if service.resources.outputs.pop(fn.resource_name() + "ArnOutput", None) is not None:
+                    removed.append(str(fn.key))
+
+        if removed:
+            warnings.warn(f"Removed ARN exports of {len(removed)} functions not listed in function_exports")
+
+    def drop_version_outputs(self, service):
+        """
+        Adds a serverless-scriptable-plugin hook removing version outputs serverless framework generates for every
+        function, the hook script is copied to the current directory.
+        """
+        if drops_version_outputs(service):
+            return
+
+        if not service.plugins.has(Scriptable):
+            service.plugins.add(Scriptable())
+
+        hooks = service.plugins.get(Scriptable).hooks
+        hook = hooks.get(VERSION_OUTPUTS_HOOK)
+        hooks[VERSION_OUTPUTS_HOOK] = [*([hook] if isinstance(hook, str) else hook or []), VERSION_OUTPUTS_SCRIPT]
+
+        src = os.path.join(os.path.dirname(__file__), "..", "..", "static", VERSION_OUTPUTS_SCRIPT)
+        shutil.copyfile(src, os.path.join(os.getcwd(), VERSION_OUTPUTS_SCRIPT))
@@ -63,25 +63,28 @@ class Encryption(Feature):
 
             return
 
-        for resource in service.resources.all():
-            if resource.title == "ServiceSecret":
-                resource.DependsOn = "ServiceEncryptionKeyAlias"
+        secret = service.resources.get("ServiceSecret")
+        if secret is not None:
+            secret.DependsOn = "ServiceEncryptionKeyAlias"
+
+        statements = list(Encryption.POLICY["Statement"])
 
         for fn in service.functions.all():
-            self.key.KeyPolicy["Statement"].append(
+            statements.append(
                 self.create_log_group_kms_statement(
                     "arn:aws:logs:${aws:region}:${aws:accountId}:log-group:/aws/lambda/" + fn.name.spinal
                 )
             )
 
-        for resource in service.resources.all():
-            if isinstance(resource, LogGroup):
-                if resource.properties.get("KmsKeyId") is not None:
-                    self.key.KeyPolicy["Statement"].append(
-                        self.create_log_group_kms_statement(
-                            "arn:aws:logs:${aws:region}:${aws:accountId}:log-group:" + resource.LogGroupName
-                        )
+        for resource in service.resources.by_type(LogGroup):
+            if resource.properties.get("KmsKeyId") is not None:
+                statements.append(
+                    self.create_log_group_kms_statement(
+                        "arn:aws:logs:${aws:region}:${aws:accountId}:log-group:" + resource.LogGroupName
                     )
+                )
+
+        self.key.KeyPolicy = dict(Encryption.POLICY, Statement=statements)
 
     def create_log_group_kms_statement(self, log_group):
         return {
@@ -0,0 +1,75 @@
+from troposphere.iam import ManagedPolicy
+
+from serverless.aws.iam import (
+    INLINE_POLICY_LIMIT,
+    MANAGED_POLICY_LIMIT,
+    POLICY_VERSION,
+    PolicyTooLargeException,
+    policy_size,
+)
+from serverless.service.types import Feature, to_plain
+
+
+class PolicyCompaction(Feature):
+    """
+    Compacts IAM statements at render time and moves statements which would push a role over the inline
+    policy limit into managed policies attached to the same role.
+
+    Limits are scaled down by headroom, as variables like ${self:service} are resolved only at deploy time.
+    """
+
+    def __init__(self, headroom=0.9, max_managed_policies=10):
+        super().__init__()
+        self.inline_limit = int(INLINE_POLICY_LIMIT * headroom)
+        self.managed_limit = int(MANAGED_POLICY_LIMIT * headroom)
+        self.max_managed_policies = max_managed_policies
+        self.policies = []
+
+    def enable(self, service):
+        pass
+
+    def pre_render(self, service):
+        super().pre_render(service)
+
+        for policy in self.policies:
+            service.resources.remove(policy)
+        self.policies = []
+
+        iam = service.provider.iam
+        roles = [(iam.role, "IamRoleLambdaExecution")]
+        inheriting = []
+
+        functions = [fn for fn in service.functions.all() if fn.iamRoleStatements]
+        for fn in functions:
+            if fn.iamRoleStatementsInherit:
+                inheriting.append((fn.iamRoleStatements.role, fn.iam_role_name()))
+
+        chunks = iam.split(self.inline_limit, self.managed_limit)
+        if len(chunks) > self.max_managed_policies:
+            raise PolicyTooLargeException("Too many managed policies required for service role")
+
+        self.attach("Service", chunks, roles + inheriting)
+
+        reserved = policy_size(iam.inline_statements) - policy_size([])
+        for fn in functions:
+            inherit = fn.iamRoleStatementsInherit
+            own = fn.iamRoleStatements.split(self.inline_limit, self.managed_limit, reserved if inherit else 0)
+
+            if len(own) + (len(chunks) if inherit else 0) > self.max_managed_policies:
+                raise PolicyTooLargeException(f"Too many managed policies required for function {fn.key}")
+
+            self.attach(fn.key.pascal, own, [(fn.iamRoleStatements.role, fn.iam_role_name())])
+
+        for policy in self.policies:
+            service.resources.add(policy)
+
+    def attach(self, prefix, chunks, roles):
+        for index, statements in enumerate(chunks, start=1):
+            self.policies.append(
+                ManagedPolicy(
+                    f"{prefix}ManagedPolicy{index}",
+                    PolicyDocument=dict(Version=POLICY_VERSION, Statement=to_plain(statements)),
+                    Roles=[name for name, _ in roles],
+                    DependsOn=[resource for _, resource in roles],
+                )
+            )
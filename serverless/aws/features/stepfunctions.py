@@ -7,6 +7,28 @@ from serverless.service.plugins.step_functions import StepFunctions as StepFunct
 from serverless.service.types import Identifier, YamlOrderedDict
 
 
+def find_fallback(states):
+    for step in states.values():
+        if step.get("Type") in ("Pass", "Fail"):
+            return step
+
+    return None
+
+
+def catch_all(states, fallback):
+    """
+    Routes every step without its own error handling to the fallback state. Steps are replaced with their
+    exported copies in the given mapping, so the original definition stays untouched.
+    """
+    for step_id, step in states.items():
+        if step.get("Catch") or step.get("Type") in ("Pass", "Fail", "Map"):
+            continue
+
+        export = step.export() if hasattr(step, "export") else dict(step)
+        export["Catch"] = [{"ErrorEquals": ["States.ALL"], "Next": fallback.id}]
+        states[step_id] = export
+
+
 class Stage(YamlOrderedDict):
     yaml_tag = "!Stage"
 
@@ -21,10 +43,14 @@ class Stage(YamlOrderedDict):
     def id(self):
         return self._function.key.pascal
 
+    def export(self):
+        export = dict(self)
+        export.pop("_function", None)
+        return export
+
     @classmethod
     def to_yaml(cls, dumper, data):
-        data.pop("_function", None)
-        return super().to_yaml(dumper, data)
+        return dumper.represent_dict(data.export())
 
 
 class Fallback(Stage):
@@ -40,10 +66,10 @@ class Fallback(Stage):
     def id(self):
         return self._name
 
-    @classmethod
-    def to_yaml(cls, dumper, data):
-        data.pop("_name")
-        return super().to_yaml(dumper, data)
+    def export(self):
+        export = super().export()
+        export.pop("_name", None)
+        return export
 
 
 class Task(Stage):
@@ -69,10 +95,10 @@ class Task(Stage):
     def id(self):
         return self.name if self.name else self._function.key.pascal
 
-    @classmethod
-    def to_yaml(cls, dumper, data):
-        data.pop("name", None)
-        return super().to_yaml(dumper, data)
+    def export(self):
+        export = super().export()
+        export.pop("name", None)
+        return export
 
 
 class Wait(Stage):
@@ -107,10 +133,10 @@ class Wait(Stage):
     def id(self):
         return self.name if self.name else self._function.key.pascal
 
-    @classmethod
-    def to_yaml(cls, dumper, data):
-        data.pop("name", None)
-        return super().to_yaml(dumper, data)
+    def export(self):
+        export = super().export()
+        export.pop("name", None)
+        return export
 
 
 class Iterator(YamlOrderedDict):
@@ -128,31 +154,25 @@ class Iterator(YamlOrderedDict):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        data["StartAt"] = str(list(data.States.keys())[0])
-        data.move_to_end("StartAt", last=False)
+        export = dict(data)
+        export.pop("map_name", None)
+        export.pop("auto_catch", None)
+        export.pop("auto_fallback", None)
+        export = dict(StartAt=export.pop("StartAt", str(list(data.States.keys())[0])), **export)
 
-        fallback = None
-        for step in data.States.values():
-            if step.get("Type") in ("Pass", "Fail"):
-                fallback = step
-                break
+        states = dict(data.States)
 
+        fallback = find_fallback(states)
         if data.auto_fallback and not fallback:
             fallback = Fallback(f"{data.map_name}Fallback", f"Failed processing map: {data.map_name}")
-            data["States"][fallback.id] = fallback
+            states[fallback.id] = fallback
 
         if data.auto_catch:
-            for step in data.States.values():
-                if step.get("Catch") or step.get("Type") in ("Pass", "Fail", "Map"):
-                    continue
-
-                step["Catch"] = [{"ErrorEquals": ["States.ALL"], "Next": fallback.id}]
+            catch_all(states, fallback)
 
-        data.pop("map_name", None)
-        data.pop("auto_catch", None)
-        data.pop("auto_fallback", None)
+        export["States"] = states
 
-        return super().to_yaml(dumper, data)
+        return dumper.represent_dict(export)
 
 
 class Map(Stage):
@@ -181,10 +201,10 @@ class Map(Stage):
     def id(self):
         return self.name
 
-    @classmethod
-    def to_yaml(cls, dumper, data):
-        data.pop("name", None)
-        return super().to_yaml(dumper, data)
+    def export(self):
+        export = super().export()
+        export.pop("name", None)
+        return export
 
 
 class State(YamlOrderedDict):
@@ -198,10 +218,14 @@ class State(YamlOrderedDict):
     def id(self):
         return self.name
 
+    def export(self):
+        export = dict(self)
+        export.pop("name", None)
+        return export
+
     @classmethod
     def to_yaml(cls, dumper, data):
-        data.pop("name", None)
-        return super().to_yaml(dumper, data)
+        return dumper.represent_dict(data.export())
 
 
 class Choice(State):
@@ -247,10 +271,10 @@ class Parallel(Stage):
     def id(self):
         return self.name
 
-    @classmethod
-    def to_yaml(cls, dumper, data):
-        data.pop("name", None)
-        return super().to_yaml(dumper, data)
+    def export(self):
+        export = super().export()
+        export.pop("name", None)
+        return export
 
 
 class Definition(YamlOrderedDict):
@@ -269,31 +293,25 @@ class Definition(YamlOrderedDict):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        if data.States:
-            data["StartAt"] = list(data.States.keys())[0]
-            data.move_to_end("StartAt", last=False)
+        export = dict(data)
+        export.pop("auto_fallback", None)
+        export.pop("auto_catch", None)
 
-        fallback = None
-        for step in data.States.values():
-            if step.get("Type") in ("Pass", "Fail"):
-                fallback = step
-                break
+        states = dict(data.States)
+        if states:
+            export = dict(StartAt=export.pop("StartAt", list(states.keys())[0]), **export)
 
+        fallback = find_fallback(states)
         if data.auto_fallback and not fallback:
             fallback = Fallback("StateMachineErrorFallback", "Error in state machine")
-            data.add(fallback)
+            states[fallback.id] = fallback
 
         if data.auto_catch:
-            for step in data.States.values():
-                if step.get("Catch") or step.get("Type") in ("Pass", "Fail", "Map"):
-                    continue
+            catch_all(states, fallback)
 
-                step["Catch"] = [{"ErrorEquals": ["States.ALL"], "Next": fallback.id}]
+        export["States"] = states
 
-        data.pop("auto_fallback", None)
-        data.pop("auto_catch", None)
-
-        return super().to_yaml(dumper, data)
+        return dumper.represent_dict(export)
 
 
 class StateMachine(YamlOrderedDict):
@@ -390,8 +408,9 @@ class StepFunctions(YamlOrderedDict):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        data.pop("service", None)
-        return super().to_yaml(dumper, data)
+        export = dict(data)
+        export.pop("service", None)
+        return super().to_yaml(dumper, export)
 
 
 class Scheduled(YamlOrderedDict):
@@ -1,20 +1,13 @@
-import importlib
-from pathlib import Path
+import warnings
 
 from serverless.aws.functions.generic import Function
 from serverless.service.plugins.appsync import AppSync
+from serverless.service.plugins.appsync.discovery import discover
 from serverless.service.plugins.appsync.plugin import ResolverExtra
+from serverless.service.plugins.appsync.templates import BATCH_RESPONSE, MUTATION_RESPONSE, MappingTemplate
 from serverless.service.types import Identifier
 
 
-def import_variable(module_name: str, variable_name: str):
-    module = importlib.import_module(module_name)
-    if not hasattr(module, variable_name):
-        return None
-
-    return getattr(module, variable_name)
-
-
 class AppSyncFunction(Function):
     yaml_tag = "!AppSyncFunction"
 
@@ -22,13 +15,12 @@ class AppSyncFunction(Function):
         super().__init__(service, name, description, handler, timeout, layers, **kwargs)
 
         module_name, function_name = self.handler.rsplit(".", 1)
-        graphql_app = import_variable(module_name, "app")
+        plugin = service.plugins.get(AppSync)
+        registrations = discover(module_name, "app", plugin.discovery if plugin else "import")
 
-        if not graphql_app:
+        if not registrations:
             return
 
-        plugin = service.plugins.get(AppSync)
-
         datasource_config = {
             'functionName': str(self.key.pascal)
         }
@@ -62,40 +54,12 @@ class AppSyncFunction(Function):
         has_query = False
         has_mutation = False
 
-        import __main__ as main
-
-        batch_resolver = Path(main.__file__).parent.absolute().joinpath("batch.response.vtl")
-        with open(batch_resolver, "w+") as f:
-            f.write("$util.toJson($context.result)")
-
-        mutation_resolver = Path(main.__file__).parent.absolute().joinpath("mutation.response.vtl")
-        with open(mutation_resolver, "w+") as f:
-            f.write("""
-#if (!$util.isNull($ctx.error))
-  $util.error(
-    $util.defaultIfNull($ctx.error.message, "UnhandledError"),
-    $util.defaultIfNull($ctx.error.type, "Lambda:Unhandled"),
-    $util.defaultIfNull($ctx.error.data, {}),
-    $util.defaultIfNull($ctx.error.errorInfo, {})
-  )
-#end
-
-#if (!$util.isNull($ctx.result) && !$util.isNull($ctx.result.error))
-  $util.error(
-    $util.defaultIfNull($ctx.result.error.message, "UnknownError"),
-    $util.defaultIfNull($ctx.result.error.type, "BadRequest"),
-    $util.defaultIfNull($ctx.result.error.data, {}),
-    $util.defaultIfNull($ctx.result.error.info, {})
-  )
-#end
-
-$util.toJson($ctx.result)
-""".strip())
-
-        for name, resolver in {
-            **graphql_app._resolver_registry.resolvers,
-            **graphql_app._batch_resolver_registry.resolvers,
-        }.items():
+        batch_resolver = plugin.templates.add(MappingTemplate(BATCH_RESPONSE, "batch.response.vtl"))
+        mutation_resolver = plugin.templates.add(MappingTemplate(MUTATION_RESPONSE, "mutation.response.vtl"))
+
+        batch_resolvers = registrations["batch_resolvers"]
+
+        for name in dict.fromkeys([*registrations["resolvers"], *batch_resolvers]):
             gql_type, gql_field = name.split(".")
             if gql_type.lower().endswith("query"):
                 has_query = True
@@ -107,21 +71,27 @@ $util.toJson($ctx.result)
 
             defintion = {"type": gql_type, "field": gql_field, "kind": "UNIT", "dataSource": str(self.key.pascal)}
 
-            if name in graphql_app._batch_resolver_registry.resolvers:
+            if name in batch_resolvers:
                 extras.max_batch_size = extras.max_batch_size or 10
-                extras.response = extras.response or Path(batch_resolver).name
+                extras.response = extras.response or batch_resolver
 
             if gql_type.lower().endswith("mutation"):
-                extras.response = extras.response or Path(mutation_resolver).name
+                extras.response = extras.response or mutation_resolver
 
             if extras.max_batch_size:
                 defintion["maxBatchSize"] = extras.max_batch_size
 
             if extras.response:
-                defintion["response"] = extras.response
+                defintion["response"] = plugin.templates.reference(extras.response)
 
             if extras.request:
-                defintion["request"] = extras.request
+                defintion["request"] = plugin.templates.reference(extras.request)
+
+            if extras.caching is not None:
+                if plugin.caching is None:
+                    warnings.warn(f"Caching of {name} has no effect, AppSync plugin has no API cache configured")
+
+                defintion["caching"] = extras.caching
 
             plugin.resolvers[str(Identifier(gql_type).camel) + str(Identifier(gql_field).camel)] = defintion
 
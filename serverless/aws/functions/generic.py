@@ -260,14 +260,14 @@ class Function(YamlOrderedDict):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        events = data.events
-        data.pop("_service", None)
-        data.pop("key", None)
-        data.pop("dlq", None)
+        export = dict(data)
+        export.pop("_service", None)
+        export.pop("key", None)
+        export.pop("dlq", None)
 
         if not data.events:
-            del data["events"]
+            del export["events"]
         else:
-            data.events = [{event.yaml_tag: event} for event in events]
+            export["events"] = [{event.yaml_tag: event} for event in data.events]
 
-        return dumper.represent_dict(data)
+        return dumper.represent_dict(export)
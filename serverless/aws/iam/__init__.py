@@ -1,10 +1,142 @@
 import abc
+import fnmatch
 import hashlib
 import json
 from abc import ABC
+from collections.abc import Mapping
+from functools import lru_cache
 
 from serverless.aws.resources import Resource
-from serverless.service.types import ResourceName, YamlOrderedDict
+from serverless.service.types import ResourceName, YamlOrderedDict, to_plain
+
+POLICY_VERSION = "2012-10-17"
+INLINE_POLICY_LIMIT = 10240
+MANAGED_POLICY_LIMIT = 6144
+
+
+class PolicyTooLargeException(Exception):
+    pass
+
+
+def freeze(value):
+    """
+    Converts JSON-like value into a hashable key, so equal inputs share a single cache entry.
+    """
+    if isinstance(value, str):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+
+    if isinstance(value, Mapping):
+        return Mapping, tuple((key, freeze(item)) for key, item in value.items())
+
+    return type(value), value
+
+
+def thaw(value):
+    if isinstance(value, str):
+        return value
+
+    if value and isinstance(value[0], type):
+        kind, content = value
+        return {key: thaw(item) for key, item in content} if kind is Mapping else content
+
+    return [thaw(item) for item in value]
+
+
+@lru_cache(maxsize=None)
+def digest(text):
+    return hashlib.sha224(text.encode("ascii")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def anonymous_sid(statement):
+    return "Policy" + digest(json.dumps(thaw(statement)))
+
+
+def as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def statement_size(statement):
+    return len(json.dumps(to_plain(statement), separators=(",", ":")))
+
+
+def policy_size(statements):
+    return statement_size(dict(Version=POLICY_VERSION, Statement=statements))
+
+
+def prune_actions(actions):
+    """
+    Drops duplicated actions and actions already covered by a wildcard action from the same list.
+    """
+    unique = {}
+    for action in actions:
+        unique.setdefault(action.lower(), action)
+
+    return [
+        action
+        for name, action in unique.items()
+        if not any(other != name and fnmatch.fnmatchcase(name, other) for other in unique)
+    ]
+
+
+def compact(statements):
+    """
+    Merges statements with the same Effect and set of actions into a single statement covering all their
+    resources. Statements with conditions, principals or NotAction/NotResource are left untouched.
+    """
+    groups = {}
+    for statement in statements:
+        if set(statement) - {"Sid", "Effect", "Action", "Resource"}:
+            groups[id(statement)] = [statement]
+            continue
+
+        actions = frozenset(action.lower() for action in prune_actions(as_list(statement["Action"])))
+        groups.setdefault((statement["Effect"], actions), []).append(statement)
+
+    compacted = []
+    for members in groups.values():
+        first = members[0]
+        if set(first) - {"Sid", "Effect", "Action", "Resource"}:
+            compacted.append(first)
+            continue
+
+        actions = prune_actions(as_list(first["Action"]))
+        if len(members) == 1 and actions == as_list(first["Action"]):
+            compacted.append(first)
+            continue
+
+        resources = {}
+        for member in members:
+            for resource in as_list(member["Resource"]):
+                resources.setdefault(json.dumps(to_plain(resource), sort_keys=True), resource)
+
+        compacted.append(dict(first, Action=actions, Resource=list(resources.values())))
+
+    return compacted
+
+
+def fragment(statement, limit):
+    """
+    Splits statement by its resources into statements which fit into the policy size limit.
+    """
+    if policy_size([statement]) <= limit:
+        return [statement]
+
+    resources = as_list(statement.get("Resource"))
+    if len(resources) < 2 or set(statement) - {"Sid", "Effect", "Action", "Resource"}:
+        raise PolicyTooLargeException(f"Statement {statement.get('Sid')} does not fit into a managed policy")
+
+    half = len(resources) // 2
+    fragments = fragment(dict(statement, Resource=resources[:half]), limit)
+    fragments += fragment(dict(statement, Resource=resources[half:]), limit)
+
+    if "Sid" not in statement:
+        return fragments
+
+    return [dict(part, Sid=f"{statement['Sid']}{index}") for index, part in enumerate(fragments, start=1)]
 
 
 class PolicyBuilder(YamlOrderedDict):
@@ -13,24 +145,62 @@ class PolicyBuilder(YamlOrderedDict):
     def __init__(self, **kwds):
         super().__init__(**kwds)
         self.statements = []
+        self._sids = {}
+        self._inline = None
 
     def append(self, policy):
-        if len(list(filter(lambda x: x["Sid"] == policy["Sid"], self.statements))):
+        if policy["Sid"] in self._sids:
             return
 
+        self._sids[policy["Sid"]] = policy
         self.statements.append(policy)
 
     def allow(self, permissions, resources, sid=None):
-        sid = sid or "Policy" + str(hashlib.sha224(json.dumps([permissions, resources]).encode("ascii")).hexdigest())
+        sid = sid or anonymous_sid(freeze([permissions, resources]))
         self.append(dict(Sid=sid, Effect="Allow", Action=permissions, Resource=resources))
 
     def deny(self, permissions, resources, sid=None):
-        sid = sid or "Policy" + str(hashlib.sha224(json.dumps([permissions, resources]).encode("ascii")).hexdigest())
+        sid = sid or anonymous_sid(freeze([permissions, resources]))
         self.append(dict(Sid=sid, Effect="Deny", Action=permissions, Resource=resources))
 
     def apply(self, preset: "IAMPreset"):
         preset.apply(self)
 
+    @property
+    def inline_statements(self):
+        return self._inline if self._inline is not None else self.statements
+
+    def split(self, limit=INLINE_POLICY_LIMIT, managed_limit=MANAGED_POLICY_LIMIT, reserved=0):
+        """
+        Compacts statements and keeps inline only those which fit into the limit (minus reserved characters).
+        Remaining statements are returned in chunks, each fitting into a single managed policy.
+        """
+        empty = policy_size([])
+        inline, inline_size = [], empty + reserved
+        chunks = []
+
+        overflow = []
+        for statement in compact(self.statements):
+            size = statement_size(statement) + 1
+
+            if inline_size + size <= limit:
+                inline.append(statement)
+                inline_size += size
+            else:
+                overflow.extend(fragment(statement, managed_limit))
+
+        for statement in overflow:
+            size = statement_size(statement) + 1
+
+            if not chunks or policy_size(chunks[-1]) + size > managed_limit:
+                chunks.append([])
+
+            chunks[-1].append(statement)
+
+        self._inline = inline
+
+        return chunks
+
     def allow_read(self, resource: Resource):
         resource.enable_read(self)
 
@@ -46,7 +216,7 @@ class PolicyBuilder(YamlOrderedDict):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        return dumper.represent_list(data.statements)
+        return dumper.represent_list(data.inline_statements)
 
 
 class ServicePolicyBuilder(PolicyBuilder):
@@ -63,8 +233,8 @@ class ServicePolicyBuilder(PolicyBuilder):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        export = dict(data.items())
-        export.pop("service", None)
+        export = {key: value for key, value in data.items() if key != "service" and not key.startswith("_")}
+        export["statements"] = data.inline_statements
         export["name"] = data.role
         return dumper.represent_dict(dict(role=export))
 
@@ -1,6 +1,4 @@
-import hashlib
-
-from serverless.aws.iam import IAMPreset, PolicyBuilder
+from serverless.aws.iam import IAMPreset, PolicyBuilder, digest
 from serverless.service import Identifier
 
 
@@ -12,5 +10,5 @@ class SQSPublisher(IAMPreset):
         policy_builder.allow(
             permissions=["sqs:SendMessage"],
             resources=str(self.resource),
-            sid="SQSPublisherI" + hashlib.sha224(str(self.resource).encode("ascii")).hexdigest(),
+            sid="SQSPublisherI" + digest(str(self.resource)),
         )
@@ -1,18 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import yaml
 
-from serverless.aws.functions.appsync import AppSyncFunction
-from serverless.aws.functions.dynamodb import DynamoDBStreamFunction
-from serverless.aws.functions.event_bridge import EventBridgeFunction
-from serverless.aws.functions.generic import Function
-from serverless.aws.functions.http import HTTPFunction
-from serverless.aws.functions.kinesis import KinesisFunction
-from serverless.aws.functions.s3 import S3Function
-from serverless.aws.functions.sqs import SQSFunction
-from serverless.aws.functions.websocket import WebsocketFunction
 from serverless.aws.iam import ServicePolicyBuilder
+from serverless.lazy import lazy_exports
 from serverless.service.environment import Environment
 from serverless.service.types import Provider as BaseProvider
 
+if TYPE_CHECKING:
+    from serverless.aws.functions.event_bridge import EventBridgeFunction
+    from serverless.aws.functions.generic import Function
+    from serverless.aws.functions.http import HTTPFunction
+
+# Function types are imported by factory methods on first use, so services only pay for triggers they use.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AppSyncFunction": ("serverless.aws.functions.appsync", "AppSyncFunction"),
+        "DynamoDBStreamFunction": ("serverless.aws.functions.dynamodb", "DynamoDBStreamFunction"),
+        "EventBridgeFunction": ("serverless.aws.functions.event_bridge", "EventBridgeFunction"),
+        "Function": ("serverless.aws.functions.generic", "Function"),
+        "HTTPFunction": ("serverless.aws.functions.http", "HTTPFunction"),
+        "KinesisFunction": ("serverless.aws.functions.kinesis", "KinesisFunction"),
+        "S3Function": ("serverless.aws.functions.s3", "S3Function"),
+        "SQSFunction": ("serverless.aws.functions.sqs", "SQSFunction"),
+        "WebsocketFunction": ("serverless.aws.functions.websocket", "WebsocketFunction"),
+    },
+)
+
 
 class Runtime(yaml.YAMLObject):
     NODE_14 = "nodejs14"
@@ -39,6 +56,8 @@ class FunctionBuilder:
         self.service = service
 
     def generic(self, name, description, handler=None, timeout=None, layers=None, **kwargs) -> Function:
+        from serverless.aws.functions.generic import Function
+
         fn = Function(self.service, name, description, handler, timeout, layers, **kwargs)
         self.service.functions.add(fn)
 
@@ -47,6 +66,8 @@ class FunctionBuilder:
     def http(
         self, name, description, path, method, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(self.service, name, description, path, method, authorizer, handler, timeout, layers, **kwargs)
         self.service.functions.add(fn)
 
@@ -55,6 +76,8 @@ class FunctionBuilder:
     def http_post(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.POST, authorizer, handler, timeout, layers, **kwargs
         )
@@ -65,6 +88,8 @@ class FunctionBuilder:
     def http_get(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.GET, authorizer, handler, timeout, layers, **kwargs
         )
@@ -75,6 +100,8 @@ class FunctionBuilder:
     def http_put(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.PUT, authorizer, handler, timeout, layers, **kwargs
         )
@@ -85,6 +112,8 @@ class FunctionBuilder:
     def http_patch(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.PATCH, authorizer, handler, timeout, layers, **kwargs
         )
@@ -95,6 +124,8 @@ class FunctionBuilder:
     def http_delete(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.DELETE, authorizer, handler, timeout, layers, **kwargs
         )
@@ -105,6 +136,8 @@ class FunctionBuilder:
     def http_options(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.OPTIONS, authorizer, handler, timeout, layers, **kwargs
         )
@@ -115,6 +148,8 @@ class FunctionBuilder:
     def http_any(
         self, name, description, path, authorizer=None, handler=None, timeout=None, layers=None, **kwargs
     ) -> HTTPFunction:
+        from serverless.aws.functions.http import HTTPFunction
+
         fn = HTTPFunction(
             self.service, name, description, path, HTTPFunction.ANY, authorizer, handler, timeout, layers, **kwargs
         )
@@ -135,6 +170,8 @@ class FunctionBuilder:
         layers=None,
         **kwargs,
     ) -> EventBridgeFunction:
+        from serverless.aws.functions.event_bridge import EventBridgeFunction
+
         fn = EventBridgeFunction(
             self.service,
             name,
@@ -165,6 +202,8 @@ class FunctionBuilder:
         layers=None,
         **kwargs,
     ):
+        from serverless.aws.functions.s3 import S3Function
+
         fn = S3Function(
             self.service, name, description, bucket, event, rules, existing, handler, timeout, layers, **kwargs
         )
@@ -173,30 +212,40 @@ class FunctionBuilder:
         return fn
 
     def kinesis(self, stream, name, description, **kwargs):
+        from serverless.aws.functions.kinesis import KinesisFunction
+
         fn = KinesisFunction(stream, self.service, name, description, **kwargs)
         self.service.functions.add(fn)
 
         return fn
 
     def dynamodb_stream(self, stream, name, description, **kwargs):
+        from serverless.aws.functions.dynamodb import DynamoDBStreamFunction
+
         fn = DynamoDBStreamFunction(stream, self.service, name, description, **kwargs)
         self.service.functions.add(fn)
 
         return fn
 
     def sqs(self, name, description, arn, **kwargs):
+        from serverless.aws.functions.sqs import SQSFunction
+
         fn = SQSFunction(self.service, name, description, arn, **kwargs)
         self.service.functions.add(fn)
 
         return fn
 
     def websocket(self, name, description, events=None, **kwargs):
+        from serverless.aws.functions.websocket import WebsocketFunction
+
         fn = WebsocketFunction(self.service, name, description, events, **kwargs)
         self.service.functions.add(fn)
 
         return fn
 
     def appsync(self, name, description, **kwargs):
+        from serverless.aws.functions.appsync import AppSyncFunction
+
         fn = AppSyncFunction(self.service, name, description, **kwargs)
         self.service.functions.add(fn)
 
@@ -242,9 +291,10 @@ class Provider(BaseProvider, yaml.YAMLObject):
 
     @classmethod
     def to_yaml(cls, dumper, data):
-        data.pop("_service", None)
-        data.pop("function_builder", None)
-        if not data.get("deploymentBucket"):
-            data.pop("deploymentBucket", None)
+        export = dict(data)
+        export.pop("_service", None)
+        export.pop("function_builder", None)
+        if not export.get("deploymentBucket"):
+            export.pop("deploymentBucket", None)
 
-        return dumper.represent_dict(data)
+        return dumper.represent_dict(export)
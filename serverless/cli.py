@@ -1,14 +1,17 @@
 import json
+import os
+import runpy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from os import getcwd
 from os.path import isfile, join
+from pathlib import Path
 
-import boto3
 import click
 import yaml
 from loguru import logger
 
-from serverless.aws.features.encryption import Encryption
-
 
 @click.group()
 def cli():
@@ -20,7 +23,132 @@ def kms():
     pass
 
 
+def find_scripts(paths, pattern):
+    for path in map(Path, paths):
+        if path.is_file():
+            yield path.absolute()
+            continue
+
+        for script in sorted(path.rglob(pattern)):
+            if not any(part.startswith(".") or part == "node_modules" for part in script.relative_to(path).parts):
+                yield script.absolute()
+
+
+def render_script(script):
+    """
+    Executes a single builder script as __main__ in its own directory, the same way `python serverless.yml.py` does.
+    Modules imported from the script directory are dropped afterwards, so services sharing module names
+    do not leak into each other when a worker renders more than one of them.
+    """
+    script = Path(script)
+    cwd = getcwd()
+    path = list(sys.path)
+    modules = set(sys.modules)
+    disabled = os.environ.pop("SERVERLESS_BUILDER_DISABLE_RENDER", None)
+    start = time.perf_counter()
+
+    try:
+        os.chdir(script.parent)
+        sys.path.insert(0, str(script.parent))
+        runpy.run_path(str(script), run_name="__main__")
+
+        return str(script), time.perf_counter() - start, None
+    except SystemExit as e:
+        error = None if e.code in (0, None) else f"SystemExit: {e.code}"
+
+        return str(script), time.perf_counter() - start, error
+    except Exception as e:
+        return str(script), time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    finally:
+        os.chdir(cwd)
+        sys.path[:] = path
+
+        directory = script.parent.resolve()
+        for name in set(sys.modules) - modules:
+            file = getattr(sys.modules[name], "__file__", None)
+            if file and Path(file).resolve().is_relative_to(directory):
+                del sys.modules[name]
+
+        if disabled is not None:
+            os.environ["SERVERLESS_BUILDER_DISABLE_RENDER"] = disabled
+
+
+@cli.command(name="render")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option("--pattern", default="serverless.yml.py", help="Builder script file name to look for in directories")
+@click.option("-w", "--workers", type=int, default=None, help="Number of worker processes, defaults to CPU count")
+@click.option("--cache", type=click.Path(file_okay=False), default=None, help="Render cache directory")
+def render(paths, pattern, workers, cache):
+    scripts = list(find_scripts(paths or [getcwd()], pattern))
+    if not scripts:
+        logger.warning(f"No {pattern} scripts found")
+        return
+
+    if cache:
+        os.environ["SERVERLESS_BUILDER_RENDER_CACHE"] = str(Path(cache).absolute())
+
+    start = time.perf_counter()
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_script, script) for script in scripts]
+
+        for future in as_completed(futures):
+            script, duration, error = future.result()
+            if error:
+                failed.append(script)
+                logger.error(f"{script} failed after {duration:.2f}s: {error}")
+            else:
+                logger.info(f"{script} rendered in {duration:.2f}s")
+
+    logger.info(f"Rendered {len(scripts) - len(failed)}/{len(scripts)} services in {time.perf_counter() - start:.2f}s")
+
+    if failed:
+        sys.exit(1)
+
+
+@cli.command(name="diff")
+@click.argument("previous", type=click.Path(exists=True, dir_okay=False))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False), default="serverless.yml")
+@click.option("--json", "as_json", is_flag=True, help="Print result as JSON for CI pipelines")
+def diff(previous, current, as_json):
+    """
+    Compares previous render (or a snapshot kept between CI runs) with the current one and prints the quickest
+    safe deployment strategy. CURRENT may be a serverless.yml.py script, which is rendered first.
+    """
+    from serverless.service.impact import analyse, load, strategy
+
+    if current.endswith(".py"):
+        script, duration, error = render_script(Path(current).absolute())
+        if error:
+            logger.error(f"{script} failed after {duration:.2f}s: {error}")
+            sys.exit(1)
+
+        current = Path(current).with_suffix("")
+
+    changes = analyse(load(previous), load(current))
+    deployment, functions = strategy(changes)
+
+    if as_json:
+        grouped = {}
+        for category, path in changes:
+            grouped.setdefault(category, []).append(path)
+
+        click.echo(json.dumps(dict(strategy=deployment, functions=functions, changes=grouped), indent=2))
+        return
+
+    for category, path in changes:
+        click.echo(f"{category:<10}{path}")
+
+    if deployment == "function":
+        click.echo("Strategy: " + " && ".join(f"sls deploy function -f {name}" for name in functions))
+    else:
+        click.echo(f"Strategy: {deployment}")
+
+
 def retrieve_key(service):
+    import boto3
+
     kms_client = boto3.client("kms")
     response = kms_client.list_keys(Limit=1000)
 
@@ -52,6 +180,10 @@ def replace_variables(variables, string):
 @click.option("-s", "--stage", required=True)
 @click.option("-r", "--region", multiple=True)
 def kms_create(service, region, stage, path):
+    import boto3
+
+    from serverless.aws.features.encryption import Encryption
+
     client = boto3.client("kms")
 
     variables = {
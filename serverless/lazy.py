@@ -0,0 +1,25 @@
+import importlib
+import sys
+
+
+def lazy_exports(module_name, exports):
+    """
+    Builds PEP 562 module-level __getattr__ and __dir__ which import exported names only on first access.
+    Exports map attribute names to (module, name) pairs, resolved values are cached in the module itself.
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+        source, attribute = exports[name]
+        value = getattr(importlib.import_module(source), attribute)
+        setattr(module, name, value)
+
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,19 +1,68 @@
+import hashlib
 import io
+import json
 import os
 import shutil
+import time
 from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 
 import yaml
 
 from serverless.aws.features.stepfunctions import StepFunctions
+from serverless.service.cache import HashingWriter, RenderCache, file_digest
 from serverless.service.configuration import Configuration
+from serverless.service.foundation import STATEFUL_TYPES, split
 from serverless.service.functions import FunctionManager
 from serverless.service.package import Package
 from serverless.service.plugins import PluginsManager
+from serverless.service.profiler import Profiler
 from serverless.service.resources import ResourceManager
-from serverless.service.types import Identifier, Provider, YamlOrderedDict
+from serverless.service.types import Dumper, Identifier, Provider, TypeIndex, YamlOrderedDict, dumps_json, to_plain
+from serverless.service.variables import load_variables, resolve
+
+
+def merge(base, overrides):
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            value = merge(merged[key], value)
+
+        merged[key] = value
+
+    return merged
+
+
+@contextmanager
+def overridden(target, overrides):
+    """
+    Temporarily applies nested overrides on top of the target mapping and restores previous values on exit.
+    """
+    missing = object()
+    applied = []
+
+    def apply(mapping, values):
+        for key, value in values.items():
+            current = mapping.get(key, missing)
+            if isinstance(value, Mapping) and isinstance(current, Mapping):
+                apply(current, value)
+                continue
+
+            applied.append((mapping, key, current))
+            mapping[key] = value
+
+    try:
+        apply(target, overrides)
+        yield target
+    finally:
+        for mapping, key, previous in reversed(applied):
+            if previous is missing:
+                del mapping[key]
+            else:
+                mapping[key] = previous
 
 
 class Builder:
@@ -43,6 +92,10 @@ class PreSetAttributesBuilder(Builder):
 class Service(OrderedDict, yaml.YAMLObject):
     yaml_tag = "!Service"
 
+    SECTIONS = ("provider", "plugins", "package", "custom", "functions", "resources", "vars")
+    HIDDEN = ("builder", "config", "function_builder", "features", "feature_types", "regions", "changed", "profiler")
+    WARNING = "# DO NOT edit this file directly, it was generated based on serverless.yml.py\n\n"
+
     def __init__(
         self,
         name: str,
@@ -54,6 +107,7 @@ class Service(OrderedDict, yaml.YAMLObject):
         **kwds,
     ):
         super().__init__(**kwds)
+        self.profiler = Profiler("SERVERLESS_BUILDER_PROFILE" in os.environ)
 
         self.service = Identifier(name)
         self.package = Package(["!./**/**", f"{self.service.snake}/**"])
@@ -86,6 +140,8 @@ class Service(OrderedDict, yaml.YAMLObject):
         self.builder = Builder(self)
         self.stepFunctions = StepFunctions(self)
         self.features = []
+        self.feature_types = TypeIndex()
+        self.changed = None
 
     def __setattr__(self, key, value):
         self[key] = value
@@ -107,60 +163,308 @@ class Service(OrderedDict, yaml.YAMLObject):
 
     def enable(self, feature):
         self.features.append(feature)
+        self.feature_types.add(feature)
         feature.enable(self)
 
-    def render(self, output=None, auto_generated_warning=True):
+    def render(self, output=None, auto_generated_warning=True, format="yaml", cache=None, profile=False):
+        """
+        Renders service into serverless.yml (or serverless.json) and returns whether the output changed, which
+        is also kept in service.changed. Files are rewritten only when their content differs.
+
+        With a cache directory (argument or SERVERLESS_BUILDER_RENDER_CACHE environment variable) a hash of the
+        normalised structure is stored per script and stage, so unchanged services skip serialisation entirely.
+
+        With profile=True (or SERVERLESS_BUILDER_PROFILE environment variable) durations of build and render
+        phases are written to serverless.yml.profile.json and printed as a table.
+        """
         if "SERVERLESS_BUILDER_DISABLE_RENDER" in os.environ:
+            return False
+
+        self.profiler.enabled = self.profiler.enabled or profile
+        if self.profiler.enabled:
+            self.profiler.record("build", time.perf_counter() - self.profiler.created)
+
+        with self.profiler.measure("render"):
+            changed = self._render(output, auto_generated_warning, format, cache)
+
+        self.write_profile()
+
+        return changed
+
+    def _render(self, output, auto_generated_warning, format, cache):
+        import __main__ as main
+
+        if output:
+            self.write(output, auto_generated_warning, format)
+            self.changed = True
+
+            return self.changed
+
+        target = Path(Path(main.__file__).stem)
+        if format == "json":
+            target = target.with_suffix(".json")
+
+        cache = cache or os.environ.get("SERVERLESS_BUILDER_RENDER_CACHE")
+        cache = RenderCache(cache) if cache else None
+        stage = self.provider.stage
+
+        if cache:
+            digest = self.digest(format, auto_generated_warning)
+            if cache.fresh(main.__file__, stage, digest, target):
+                self.changed = False
+
+                return self.changed
+
+        # Stream into a temporary file next to the target and replace it only when content differs, so unchanged
+        # output keeps its modification time and is never held in memory as a whole
+        temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(temporary, "wb") as f:
+                stream = HashingWriter(f)
+                self.write(stream, auto_generated_warning, format)
+
+            content = stream.hexdigest()
+            self.changed = file_digest(target) != content
+            if self.changed:
+                with self.profiler.measure("write"):
+                    os.replace(temporary, target)
+        finally:
+            if temporary.exists():
+                temporary.unlink()
+
+        if cache:
+            cache.store(main.__file__, stage, digest, target, content)
+
+        return self.changed
+
+    def write(self, stream, auto_generated_warning=True, format="yaml"):
+        if format == "json":
+            self.dump_json(stream)
+
+            return
+
+        if auto_generated_warning:
+            stream.write(self.WARNING)
+
+        self.dump(stream)
+
+    def digest(self, format="yaml", auto_generated_warning=True):
+        """
+        Hashes service structure in emitted order, so reordered keys count as a change, independent of emitter
+        formatting.
+        """
+        self.pre_render()
+
+        with self.profiler.measure("digest"):
+            plain = {key: to_plain(value) for key, value in self.sections()}
+            normalised = json.dumps([format, auto_generated_warning, plain], default=str)
+
+            return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+    def write_profile(self):
+        if not self.profiler.enabled:
             return
 
         import __main__ as main
 
-        output = output if output else open(Path(main.__file__).stem, "w+")
-        content = (
-            "# DO NOT edit this file directly, it was generated based on serverless.yml.py\n\n" + str(self)
-            if auto_generated_warning
-            else str(self)
+        self.profiler.count("functions", len(self.functions.all()))
+        self.profiler.count("resources", len(self.resources.all()))
+        self.profiler.count("plugins", len(self.plugins.all()))
+        self.profiler.count("features", len(self.features))
+        self.profiler.write(Path(main.__file__).absolute().with_name(Path(main.__file__).stem + ".profile.json"))
+
+    def render_matrix(self, stages, regions=None, overrides=None, output_dir=None, auto_generated_warning=True):
+        """
+        Renders one file per stage and region from a single build, e.g. serverless.prod.us-east-1.yml.
+
+        Overrides are keyed by stage or (stage, region) and hold nested values applied on top of the service
+        for that variant only, e.g. {("prod", "eu-west-1"): {"provider": {"memorySize": 512}}}. Sections not
+        touched by any override are serialised once and reused for every variant.
+        """
+        if "SERVERLESS_BUILDER_DISABLE_RENDER" in os.environ:
+            return []
+
+        import __main__ as main
+
+        target = Path(Path(main.__file__).stem)
+        output_dir = Path(output_dir) if output_dir else Path(main.__file__).parent
+        overrides = overrides or {}
+        shared = {}
+        written = []
+
+        self.pre_render()
+
+        for stage in stages:
+            for region in regions or [None]:
+                cell = {"provider": {"stage": stage, "region": region} if region else {"stage": stage}}
+                cell = merge(cell, overrides.get(stage, {}))
+                cell = merge(cell, overrides.get((stage, region), {}))
+
+                suffix = f".{stage}.{region}" if region else f".{stage}"
+                path = output_dir.joinpath(target.stem + suffix + target.suffix)
+
+                with overridden(self, cell), open(path, "w+") as output:
+                    if auto_generated_warning:
+                        output.write(self.WARNING)
+
+                    for key, value in self.sections():
+                        if key in cell:
+                            self.dump_section(output, key, value)
+                            continue
+
+                        if key not in shared:
+                            buf = io.StringIO()
+                            self.dump_section(buf, key, value)
+                            shared[key] = buf.getvalue()
+
+                        output.write(shared[key])
+
+                written.append(path)
+
+        self.write_profile()
+
+        return written
+
+    def render_foundation(self, types=STATEFUL_TYPES, wiring="exports", auto_generated_warning=True):
+        """
+        Renders long-lived resources (tables, buckets, streams, KMS keys, secrets) into serverless.foundation.yml
+        and everything else into serverless.yml. References from the compute stack are wired through
+        CloudFormation exports or, with wiring="ssm", SSM parameters. Deploy the foundation first with
+        `sls deploy --config serverless.foundation.yml`, routine deploys then touch only the compute stack.
+        """
+        if "SERVERLESS_BUILDER_DISABLE_RENDER" in os.environ:
+            return []
+
+        import __main__ as main
+
+        self.pre_render()
+
+        target = Path(main.__file__).absolute().parent.joinpath(Path(main.__file__).stem)
+        compute, foundation = split({key: to_plain(value) for key, value in self.sections()}, types, wiring)
+        written = []
+
+        for path, sections in ((target, compute), (target.with_suffix(".foundation" + target.suffix), foundation)):
+            with open(path, "w+") as output:
+                if auto_generated_warning:
+                    output.write(self.WARNING)
+
+                for key, value in sections.items():
+                    self.dump_section(output, key, value)
+
+            written.append(path)
+
+        self.write_profile()
+
+        return written
+
+    def render_resolved(self, stage, region, account_id=None, variables=None, output=None, auto_generated_warning=True):
+        """
+        Renders serverless.<stage>.<region>.resolved.yml with variables substituted at build time: stage, region,
+        account id, environment variables, ${self:...} references and stage variables (variables.yml unless given).
+        Only references the framework has to look up during deployment (ssm, cf, s3...) are left in the output, so
+        variable resolution no longer slows down packaging of large services. The .resolved suffix keeps it apart
+        from render_matrix output.
+        """
+        if "SERVERLESS_BUILDER_DISABLE_RENDER" in os.environ:
+            return None
+
+        import __main__ as main
+
+        if variables is None:
+            variables = load_variables(Path(main.__file__).parent, stage, self.config.advanced_variables)
+
+        self.pre_render()
+
+        with self.profiler.measure("resolve"):
+            plain = {key: to_plain(value) for key, value in self.sections()}
+            resolved = resolve(plain, stage, region, account_id, variables)
+
+        target = Path(Path(main.__file__).stem)
+        path = Path(output) if output else Path(main.__file__).parent.joinpath(
+            f"{target.stem}.{stage}.{region}.resolved{target.suffix}"
         )
 
-        output.write(content)
+        with open(path, "w+") as stream:
+            if auto_generated_warning:
+                stream.write(self.WARNING)
 
-    def __str__(self):
-        buf = io.StringIO()
-        yaml.dump(self, buf, sort_keys=False, indent=2, width=1000)
-        buf.seek(0)
-        tmp_buf = io.StringIO()
+            for key, value in resolved.items():
+                self.dump_section(stream, key, value)
 
-        for line in buf:
-            if line.split(":")[0] in ("provider", "plugins", "package", "custom", "functions", "resources", "vars"):
-                tmp_buf.write("\n")
+        self.write_profile()
 
-            tmp_buf.write(line)
-        tmp_buf.seek(0)
+        return path
 
-        return tmp_buf.read()
+    def dump(self, stream):
+        """
+        Writes service definition to the stream one top-level section at a time, so only a single section
+        is held in memory while emitting.
+        """
+        self.pre_render()
 
-    def has(self, feature):
-        return len(list(filter(lambda x: isinstance(x, feature), self.features))) > 0
+        for key, value in self.sections():
+            self.dump_section(stream, key, value)
 
-    def get_feature(self, feature):
-        return next(filter(lambda x: isinstance(x, feature), self.features), None)
+    def dump_json(self, stream):
+        """
+        Writes service definition as serverless.json, skipping YAML emitter altogether.
+        """
+        self.pre_render()
 
-    @classmethod
-    def to_yaml(cls, dumper, data):
-        data.pop("builder", None)
-        data.pop("config", None)
-        data.pop("function_builder", None)
+        plain = {}
+        for key, value in self.sections():
+            with self.profiler.measure(f"serialise.{key}"):
+                plain[key] = to_plain(value)
+
+        with self.profiler.measure("emit.json"):
+            stream.write(dumps_json(plain))
+            stream.write("\n")
 
-        if not data.stepFunctions.stateMachines:
-            data.pop("stepFunctions", None)
+    def dump_section(self, stream, key, value):
+        if key in self.SECTIONS:
+            stream.write("\n")
 
-        for plugin in data.plugins.all():
-            plugin.pre_render(data)
+        with self.profiler.measure(f"serialise.{key}"):
+            yaml.dump({key: value}, stream, Dumper=Dumper.sync(), sort_keys=False, indent=2, width=1000)
 
-        for feature in data.features:
-            feature.pre_render(data)
+    def sections(self):
+        """
+        Yields top-level sections that end up in serverless.yml, skipping builder-only attributes.
+        Service itself is left untouched, so it can be rendered any number of times.
+        """
+        for key, value in self.items():
+            if key in self.HIDDEN:
+                continue
 
-        data.pop("features", None)
-        data.pop("regions", None)
+            if key == "stepFunctions" and not value.stateMachines:
+                continue
+
+            yield key, value
+
+    def __str__(self):
+        buf = io.StringIO()
+        self.dump(buf)
+
+        return buf.getvalue()
+
+    def has(self, feature):
+        return feature in self.feature_types
+
+    def get_feature(self, feature):
+        return self.feature_types.get(feature)
+
+    def pre_render(self):
+        with self.profiler.measure("pre_render"):
+            for plugin in self.plugins.all():
+                with self.profiler.measure(f"pre_render.plugin.{type(plugin).__name__}"):
+                    plugin.pre_render(self)
+
+            for feature in self.features:
+                with self.profiler.measure(f"pre_render.feature.{type(feature).__name__}"):
+                    feature.pre_render(self)
+
+    @classmethod
+    def to_yaml(cls, dumper, data):
+        data.pre_render()
 
-        return dumper.represent_dict(data)
+        return dumper.represent_dict(dict(data.sections()))
@@ -0,0 +1,76 @@
+import hashlib
+import json
+from pathlib import Path
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """
+    Hashes file content in chunks, returns None when the file does not exist.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+
+    return digest.hexdigest()
+
+
+class HashingWriter:
+    """
+    Text stream writing UTF-8 encoded content to a binary file while hashing it, so written content can be
+    compared with an existing file without holding either of them in memory.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        self.digest.update(data)
+
+        return self.file.write(data)
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered output hashes, one small file per script and stage, so services rendered in
+    parallel never write to the same file. Entries are keyed on content of the rendered file rather than its
+    modification time, so a cache kept between CI runs still hits on a fresh checkout.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def entry(self, script, stage):
+        key = f"{Path(script).resolve()}:{stage}"
+
+        return self.directory.joinpath(hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def fresh(self, script, stage, digest, target):
+        """
+        Checks whether target was rendered from the same structure and was not touched since.
+        """
+        try:
+            entry = json.loads(self.entry(script, stage).read_text())
+        except (FileNotFoundError, ValueError):
+            return False
+
+        if entry.get("hash") != digest or entry.get("output") != str(Path(target).resolve()):
+            return False
+
+        return entry.get("content") == file_digest(target)
+
+    def store(self, script, stage, digest, target, content=None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.entry(script, stage).write_text(json.dumps(self.describe(digest, target, content)))
+
+    @staticmethod
+    def describe(digest, target, content=None):
+        return dict(hash=digest, output=str(Path(target).resolve()), content=content or file_digest(target))
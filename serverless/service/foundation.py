@@ -0,0 +1,150 @@
+STATEFUL_TYPES = (
+    "AWS::DynamoDB::Table",
+    "AWS::DynamoDB::GlobalTable",
+    "AWS::S3::Bucket",
+    "AWS::Kinesis::Stream",
+    "AWS::KMS::Key",
+    "AWS::KMS::Alias",
+    "AWS::SecretsManager::Secret",
+)
+
+
+FOUNDATION_PROVIDER = ("name", "stage", "region", "deploymentBucket", "stackTags")
+FOUNDATION_CUSTOM = ("vars", "var_files")
+
+
+class FoundationReferenceException(Exception):
+    pass
+
+
+def reference(value):
+    """
+    Returns (logical id, attribute) for Ref and Fn::GetAtt intrinsic functions, None for anything else.
+    """
+    if not isinstance(value, dict) or len(value) != 1:
+        return None
+
+    if "Ref" in value and isinstance(value["Ref"], str):
+        return value["Ref"], None
+
+    target = value.get("Fn::GetAtt")
+    if isinstance(target, str) and "." in target:
+        return tuple(target.split(".", 1))
+
+    if isinstance(target, list) and len(target) == 2:
+        return target[0], target[1]
+
+    return None
+
+
+def walk(value, visit):
+    """
+    Copies plain structure, replacing every value for which visit returns something other than None.
+    """
+    replaced = visit(value)
+    if replaced is not None:
+        return replaced
+
+    if isinstance(value, dict):
+        return {key: walk(item, visit) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [walk(item, visit) for item in value]
+
+    return value
+
+
+def without(depends_on, moved):
+    remaining = [name for name in ([depends_on] if isinstance(depends_on, str) else depends_on) if name not in moved]
+
+    return remaining or None
+
+
+def split(sections, types=STATEFUL_TYPES, wiring="exports"):
+    """
+    Splits plain service sections into compute and foundation service definitions. Resources of given types are
+    moved to the foundation, references to them are replaced with Fn::ImportValue (wiring="exports") or
+    ${ssm:} variables (wiring="ssm") backed by outputs and parameters of the foundation stack.
+    """
+    name = sections["service"]
+    resources = sections.get("resources", {})
+    moved = {title for title, resource in resources.get("Resources", {}).items() if resource.get("Type") in types}
+    wired = {}
+
+    def link(value):
+        ref = reference(value)
+        if ref is None or ref[0] not in moved:
+            return None
+
+        logical, attribute = ref
+        key = logical + (attribute or "Ref").replace(".", "")
+        wired[key] = value
+
+        if wiring == "ssm":
+            return f"${{ssm:/services/{name}/${{sls:stage}}/foundation/{key}}}"
+
+        return {"Fn::ImportValue": f"{name}-${{sls:stage}}-foundation-{key}"}
+
+    compute = {}
+    for key, value in sections.items():
+        if key == "resources":
+            value = dict(value, Resources={t: r for t, r in value.get("Resources", {}).items() if t not in moved})
+
+        compute[key] = walk(value, link)
+
+    for resource in list(compute.get("resources", {}).get("Resources", {}).values()) + list(
+        compute.get("functions", {}).values()
+    ):
+        for key in ("DependsOn", "dependsOn"):
+            if key in resource:
+                remaining = without(resource[key], moved)
+                if remaining:
+                    resource[key] = remaining
+                else:
+                    del resource[key]
+
+    foundation_resources = {
+        title: resource for title, resource in resources.get("Resources", {}).items() if title in moved
+    }
+
+    def leak(value):
+        ref = reference(value)
+        if ref is not None and ref[0] not in moved and not ref[0].startswith("AWS::"):
+            raise FoundationReferenceException(f"Foundation resources cannot reference {ref[0]} from compute stack")
+
+        return None
+
+    walk(foundation_resources, leak)
+    for resource in foundation_resources.values():
+        for dependency in without(resource.get("DependsOn", []), moved) or []:
+            leak({"Ref": dependency})
+
+    outputs = {}
+    for key, value in wired.items():
+        if wiring == "ssm":
+            foundation_resources[key + "Parameter"] = dict(
+                Type="AWS::SSM::Parameter",
+                Properties=dict(Name=f"/services/{name}/${{sls:stage}}/foundation/{key}", Type="String", Value=value),
+            )
+        else:
+            outputs[key] = dict(Value=value, Export=dict(Name=f"{name}-${{sls:stage}}-foundation-{key}"))
+
+    provider, custom = sections.get("provider", {}), sections.get("custom", {})
+    referenced = {key for key in custom if f"${{self:custom.{key}" in str(foundation_resources)}
+    foundation = dict(
+        service=f"{name}-foundation",
+        variablesResolutionMode=sections.get("variablesResolutionMode"),
+        provider={key: value for key, value in provider.items() if key in FOUNDATION_PROVIDER},
+        custom={key: value for key, value in custom.items() if key in FOUNDATION_CUSTOM or key in referenced},
+        resources=dict(
+            Description=resources.get("Description"),
+            Resources=foundation_resources,
+            Conditions=resources.get("Conditions", {}),
+            Outputs=outputs,
+        ),
+    )
+
+    # foundation is a separate service, while names of moved resources were built from the compute one
+    foundation = walk(foundation, lambda v: v.replace("${self:service}", name) if isinstance(v, str) else None)
+
+    return compute, foundation
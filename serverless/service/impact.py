@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+
+import yaml
+
+FUNCTION = "function"
+IAM = "iam"
+RESOURCE = "resource"
+GLOBAL = "global"
+
+# Function keys `sls deploy function` applies with the code and configuration update, every other key (events,
+# log retention, concurrency, retries, tags, alarms...) is applied by a stack update only
+FUNCTION_KEYS = (
+    "handler",
+    "environment",
+    "memorySize",
+    "timeout",
+    "layers",
+    "runtime",
+    "description",
+    "vpc",
+    "kmsKeyArn",
+    "ephemeralStorageSize",
+    "architecture",
+    "image",
+    "package",
+)
+FUNCTION_IAM_KEYS = ("iamRoleStatements", "iamRoleStatementsName", "iamRoleStatementsInherit", "role")
+
+# Top-level sections compiled into CloudFormation resources
+RESOURCE_SECTIONS = ("resources", "stepFunctions", "appSync")
+
+
+def load(path):
+    """
+    Loads rendered serverless.yml or serverless.json.
+    """
+    with open(path) as f:
+        if Path(path).suffix == ".json":
+            return json.load(f)
+
+        return yaml.safe_load(f) or {}
+
+
+def changed_keys(previous, current):
+    return [key for key in dict.fromkeys([*previous, *current]) if previous.get(key) != current.get(key)]
+
+
+def classify_function(name, previous, current):
+    if previous is None or current is None:
+        return [(RESOURCE, f"functions.{name}")]
+
+    changes = []
+    for key in changed_keys(previous, current):
+        if key in FUNCTION_KEYS:
+            changes.append((FUNCTION, f"functions.{name}.{key}"))
+        elif key in FUNCTION_IAM_KEYS:
+            changes.append((IAM, f"functions.{name}.{key}"))
+        else:
+            changes.append((RESOURCE, f"functions.{name}.{key}"))
+
+    return changes
+
+
+def classify_resource(title, previous, current):
+    types = {(definition or {}).get("Type", "") for definition in (previous, current)}
+    category = IAM if all(t.startswith("AWS::IAM::") for t in types) else RESOURCE
+
+    return [(category, f"resources.Resources.{title}")]
+
+
+def analyse(previous, current):
+    """
+    Compares two renders and returns a list of (category, path) changes, where category is one of
+    function (configuration of a single function), iam, resource or global.
+    """
+    changes = []
+
+    for section in changed_keys(previous, current):
+        before, after = previous.get(section) or {}, current.get(section) or {}
+
+        if section == "functions":
+            for name in changed_keys(before, after):
+                changes.extend(classify_function(name, before.get(name), after.get(name)))
+        elif section == "resources":
+            before_resources, after_resources = before.get("Resources") or {}, after.get("Resources") or {}
+            for title in changed_keys(before_resources, after_resources):
+                changes.extend(classify_resource(title, before_resources.get(title), after_resources.get(title)))
+
+            for key in changed_keys(before, after):
+                if key != "Resources":
+                    changes.append((RESOURCE, f"resources.{key}"))
+        elif section == "provider" and isinstance(before, dict) and isinstance(after, dict):
+            for key in changed_keys(before, after):
+                changes.append((IAM if key in ("iam", "iamRoleStatements") else GLOBAL, f"provider.{key}"))
+        elif section in RESOURCE_SECTIONS:
+            changes.append((RESOURCE, section))
+        else:
+            changes.append((GLOBAL, section))
+
+    return changes
+
+
+def strategy(changes):
+    """
+    Picks the quickest safe deployment: none, function (only `sls deploy function` of returned functions is needed)
+    or full stack update.
+    """
+    if not changes:
+        return "none", []
+
+    if all(category == FUNCTION for category, _ in changes):
+        return FUNCTION, list(dict.fromkeys(path.split(".")[1] for _, path in changes))
+
+    return "full", []
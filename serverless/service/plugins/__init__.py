@@ -1,6 +1,6 @@
 import yaml
 
-from serverless.service.types import Plugin
+from serverless.service.types import Plugin, TypeIndex
 
 
 class PluginsManager(yaml.YAMLObject):
@@ -10,22 +10,18 @@ class PluginsManager(yaml.YAMLObject):
         super().__init__()
         self._service = service
         self._plugins = []
+        self._types = TypeIndex()
 
     def add(self, plugin: Plugin):
         plugin.enable(self._service)
         self._plugins.append(plugin)
+        self._types.add(plugin)
 
     def get(self, plugin):
-        for p in self._plugins:
-            if isinstance(p, plugin):
-                return p
+        return self._types.get(plugin)
 
     def has(self, plugin):
-        for p in self._plugins:
-            if isinstance(p, plugin):
-                return True
-
-        return False
+        return plugin in self._types
 
     def all(self):
         return self._plugins
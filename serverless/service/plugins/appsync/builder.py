@@ -1,5 +1,9 @@
+import hashlib
 import inspect
+import json
+import os
 import re
+import threading
 import typing
 from datetime import date, datetime
 from enum import Enum
@@ -51,6 +55,62 @@ class AWSDateTime:
         return datetime.fromisoformat(value)
 
 
+SCHEMA_CACHE_VERSION = 2
+
+# Generated schemas by fingerprint and strawberry types by model, shared by builders within the process
+_schemas = {}
+_converted = {}
+_lock = threading.RLock()
+
+
+# Field metadata strawberry uses when generating the schema, besides annotation and default
+FIELD_METADATA = ("alias", "title", "description", "examples", "json_schema_extra", "deprecated", "metadata")
+
+
+def stable_repr(value):
+    """
+    repr without memory addresses of functions, so fingerprints are stable between processes.
+    """
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{getattr(value, '__module__', '')}.{value.__qualname__}"
+
+    return repr(value)
+
+
+def model_fingerprint(model):
+    if issubclass(model, Enum):
+        return [(member.name, repr(member.value)) for member in model]
+
+    fingerprint = []
+    for name, field in model.model_fields.items():
+        default = field.get_default(call_default_factory=True) if not field.is_required() else None
+        metadata = [stable_repr(getattr(field, key, None)) for key in FIELD_METADATA]
+
+        fingerprint.append((name, repr(field.annotation), field.is_required(), repr(default), *metadata))
+
+    return fingerprint
+
+
+def converted(model, kind, directives=None):
+    """
+    Converts pydantic model (or enum) into strawberry type, reusing conversions of the same model.
+    """
+    key = (model, kind, tuple((type(directive).__qualname__, repr(directive)) for directive in directives or []))
+
+    # Nested fields are resolved through the strawberry type registered on the model, so every model is
+    # converted once even when schemas are built concurrently
+    with _lock:
+        if key not in _converted:
+            if kind is Enum:
+                _converted[key] = strawberry.enum(model)
+            else:
+                _converted[key] = kind(model=model, all_fields=True, directives=directives)(
+                    type(model.__name__, (), {})
+                )
+
+        return _converted[key]
+
+
 def resolve_wrapped(func):
     if hasattr(func, "__wrapped__"):
         return resolve_wrapped(func.__wrapped__)
@@ -145,6 +205,12 @@ def aws_api_key(func):
     return schema_directive(func, Directive())
 
 
+def schema_cache_entry(fingerprint, cache=None):
+    directory = cache or os.environ.get("SERVERLESS_BUILDER_RENDER_CACHE")
+
+    return Path(directory).joinpath(f"schema-{fingerprint}.graphql") if directory else None
+
+
 class SchemaBuilder:
     def __init__(self, resolver: AppSyncResolver, namespace=None):
         self.resolver = resolver
@@ -152,30 +218,16 @@ class SchemaBuilder:
         self.models = {}
         self._types = {strawberry_type: {}, strawberry_input: {}, Enum: {}}
         self._forced = []
+        self._pending = []
 
     def add_type(self, model, forced=False):
-        if issubclass(model, Enum):
-            item = strawberry.enum(model)
-            self._types[Enum][self._extract_name(model)] = item
-        else:
-            item = strawberry_type(model=model, all_fields=True)(type(model.__name__, (), {}))
-            self._types[strawberry_type][self._extract_name(model)] = item
-
-        if forced and item:
-            self._forced.append(item)
-
+        self._pending.append((model, Enum if issubclass(model, Enum) else strawberry_type, forced))
         self.models[self._extract_name(model)] = model
 
         return self
 
     def add_input(self, model, forced=False):
-        item = strawberry_input(model=model, all_fields=True)(type(model.__name__, (), {}))
-
-        self._types[strawberry_input][self._extract_name(model)] = item
-
-        if forced:
-            self._forced.append(item)
-
+        self._pending.append((model, strawberry_input, forced))
         self.models[self._extract_name(model)] = model
 
         return self
@@ -192,15 +244,77 @@ class SchemaBuilder:
 
         return self
 
-    def render(self, output_file=None):
-        manager = ResolverManager(self)
+    def resolvers(self):
+        resolvers = []
         for name, definition in self.resolver._resolver_registry.resolvers.items():
             parameters, output, directives = self._get_function_signature(definition["func"])
 
             if name in self.resolver._batch_resolver_registry.resolvers:
                 parameters = []
 
-            manager.register(Resolver(name, parameters, output, directives))
+            resolvers.append(Resolver(name, parameters, output, directives))
+
+        return resolvers
+
+    def fingerprint(self, resolvers):
+        """
+        Hashes everything the schema is generated from: namespace, fields of registered and referenced models,
+        and resolver signatures with directives, so unchanged schema can be reused without strawberry.
+        """
+        models = {}
+
+        def collect(annotation):
+            if inspect.isclass(annotation) and issubclass(annotation, (BaseModel, Enum)):
+                name = f"{annotation.__module__}.{annotation.__qualname__}"
+                if name in models:
+                    return
+
+                models[name] = annotation
+                for field in getattr(annotation, "model_fields", {}).values():
+                    collect(field.annotation)
+
+            for argument in get_args(annotation):
+                collect(argument)
+
+        for model, _, _ in self._pending:
+            collect(model)
+
+        for resolver in resolvers:
+            for annotation in [*dict(resolver.parameters).values(), resolver.output]:
+                collect(annotation)
+
+        definition = dict(
+            version=SCHEMA_CACHE_VERSION,
+            namespace=self.namespace,
+            pending=[(self._extract_name(model), kind.__name__, forced) for model, kind, forced in self._pending],
+            models={name: model_fingerprint(model) for name, model in models.items()},
+            resolvers=[
+                (
+                    resolver.type,
+                    resolver.name,
+                    [(name, repr(annotation)) for name, annotation in dict(resolver.parameters).items()],
+                    repr(resolver.output),
+                    [(type(directive).__qualname__, repr(directive)) for directive in resolver.directives or []],
+                )
+                for resolver in resolvers
+            ],
+        )
+
+        return hashlib.sha256(json.dumps(definition, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+    def build(self, resolvers):
+        for model, kind, forced in self._pending:
+            item = converted(model, kind)
+            self._types[kind][self._extract_name(model)] = item
+
+            if forced and item:
+                self._forced.append(item)
+
+        self._pending = []
+
+        manager = ResolverManager(self)
+        for resolver in resolvers:
+            manager.register(resolver)
 
         content = str(
             strawberry.Schema(
@@ -211,15 +325,45 @@ class SchemaBuilder:
             )
         )
 
-        import __main__ as main
-
         content = re.sub(r"scalar AWS(DateTime|Phone|Date)\n+", "", content, 0, re.MULTILINE)
         content = re.sub(r"directive @.* on .*\n+", "", content, 0, re.MULTILINE)
 
-        if not output_file:
-            output_file = open(Path(main.__file__).stem + ".graphql", "w+")
+        return content
+
+    def render(self, output_file=None, cache=None):
+        """
+        Writes GraphQL schema to the output file (by default serverless.yml.graphql, named after the script, in the
+        current directory next to rendered serverless.yml).
+        Generated schema is cached by fingerprint in memory and, with a cache directory (argument or
+        SERVERLESS_BUILDER_RENDER_CACHE environment variable), on disk, so strawberry runs only when models or
+        resolver signatures change. Default output file is rewritten only when content differs.
+        """
+        resolvers = self.resolvers()
+        fingerprint = self.fingerprint(resolvers)
+        entry = schema_cache_entry(fingerprint, cache)
+
+        content = _schemas.get(fingerprint)
+        if content is None and entry and entry.exists():
+            content = entry.read_text()
+
+        if content is None:
+            content = self.build(resolvers)
 
-        output_file.write(content)
+            if entry:
+                entry.parent.mkdir(parents=True, exist_ok=True)
+                entry.write_text(content)
+
+        _schemas[fingerprint] = content
+
+        if output_file:
+            output_file.write(content)
+            return
+
+        import __main__ as main
+
+        target = Path(Path(main.__file__).stem + ".graphql")
+        if not target.exists() or target.read_text() != content:
+            target.write_text(content)
 
     def as_output(self, pydantic_type: type[BaseModel], directives=None):
         return self.as_type(pydantic_type, strawberry_type, directives=directives)
@@ -243,9 +387,7 @@ class SchemaBuilder:
                 resolved = self._types[output_type][resolver_type.__name__]
 
             else:
-                resolved = output_type(model=resolver_type, all_fields=True, directives=directives)(
-                    type(resolver_type.__name__, (), {})
-                )
+                resolved = converted(resolver_type, output_type, directives)
 
                 self._types[output_type][resolver_type.__name__] = resolved
         else:
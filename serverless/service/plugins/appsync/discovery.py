@@ -0,0 +1,229 @@
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+# Registry methods of AppSyncResolver and positional order of their arguments
+REGISTRATIONS = {"resolver": "resolvers", "batch_resolver": "batch_resolvers"}
+ARGUMENTS = ("type_name", "field_name")
+
+_cache = {}
+
+
+class StaticDiscoveryException(Exception):
+    """
+    Raised when resolvers cannot be discovered from the source alone and the module has to be imported.
+    """
+
+
+def import_registrations(module_name, variable_name="app"):
+    module = importlib.import_module(module_name)
+    app = getattr(module, variable_name, None)
+    if not app:
+        return None
+
+    return dict(
+        resolvers=list(app._resolver_registry.resolvers),
+        batch_resolvers=list(app._batch_resolver_registry.resolvers),
+    )
+
+
+def is_app(node, variable_name):
+    return isinstance(node, ast.Name) and node.id == variable_name
+
+
+def registration_name(call):
+    values = dict(type_name="*", field_name=None)
+    arguments = [*zip(ARGUMENTS, call.args), *((keyword.arg, keyword.value) for keyword in call.keywords)]
+
+    for name, value in arguments:
+        if name not in ARGUMENTS:
+            continue
+
+        if not isinstance(value, ast.Constant):
+            raise StaticDiscoveryException(f"Non literal {name} in line {call.lineno}")
+
+        values[name] = value.value
+
+    return f"{values['type_name']}.{values['field_name']}"
+
+
+def parse_registrations(source, variable_name="app"):
+    """
+    Finds @app.resolver and @app.batch_resolver registrations in the module source, in the order they are
+    executed on import. Returns None when module does not define the app.
+    """
+    tree = source if isinstance(source, ast.AST) else ast.parse(source)
+    defined = False
+
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [alias.asname or alias.name for alias in node.names]
+            if variable_name in names or "*" in names:
+                raise StaticDiscoveryException(f"{variable_name} is imported in line {node.lineno}")
+
+        if not isinstance(node, (ast.Assign, ast.AnnAssign)):
+            continue
+
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        if any(is_app(target, variable_name) for target in targets):
+            value = node.value
+            func = getattr(value, "func", None)
+            if getattr(func, "id", getattr(func, "attr", None)) != "AppSyncResolver":
+                raise StaticDiscoveryException(f"{variable_name} is not an AppSyncResolver in line {node.lineno}")
+
+            defined = True
+
+    if not defined:
+        return None
+
+    # Registrations happen in import order, decorators of a single function are applied bottom-up
+    order = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for index, decorator in enumerate(node.decorator_list):
+                order[id(decorator)] = (node.lineno, node.col_offset, -index)
+
+    registrations = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+
+        if any(is_app(argument, variable_name) for argument in [*node.args, *(k.value for k in node.keywords)]):
+            raise StaticDiscoveryException(f"{variable_name} is passed to a call in line {node.lineno}")
+
+        func = node.func
+        if not isinstance(func, ast.Attribute) or not is_app(func.value, variable_name):
+            continue
+
+        if func.attr == "include_router":
+            raise StaticDiscoveryException(f"Router included in line {node.lineno}")
+
+        if func.attr in REGISTRATIONS:
+            registrations.append((order.get(id(node), (node.lineno, node.col_offset, 0)), node))
+
+    found = {kind: {} for kind in REGISTRATIONS.values()}
+    for _, call in sorted(registrations, key=lambda registration: registration[0]):
+        found[REGISTRATIONS[call.func.attr]].setdefault(registration_name(call), None)
+
+    return {kind: list(names) for kind, names in found.items()}
+
+
+def module_path(root, name):
+    base = Path(root).joinpath(*name.split("."))
+    for path in (base.with_suffix(".py"), base.joinpath("__init__.py")):
+        if path.is_file():
+            return path
+
+    return None
+
+
+def imported_names(tree, package):
+    """
+    Yields names of modules (and their parent packages) a module may import, including `from x import y`
+    submodules.
+    """
+    for node in ast.walk(tree):
+        names = []
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name("." * node.level + (node.module or ""), package)
+            except (ImportError, ValueError):
+                continue
+
+            names = [base, *(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")]
+
+        for name in names:
+            parts = name.split(".")
+            yield from (".".join(parts[: index + 1]) for index in range(len(parts)))
+
+
+def local_modules(origin, module_name, tree):
+    """
+    Returns sources of modules from the handler's source tree it imports, directly or through other local modules.
+    Those are executed on import and may register resolvers on the app as a side effect.
+    """
+    origin = Path(origin)
+    depth = len(module_name.split(".")) - (origin.name != "__init__.py")
+    root = origin.parents[depth]
+
+    found = {}
+    queue = [(module_name, origin.name == "__init__.py", tree)]
+    while queue:
+        name, is_package, node = queue.pop()
+        package = name if is_package else name.rpartition(".")[0]
+
+        for imported in imported_names(node, package):
+            path = module_path(root, imported)
+            if imported == module_name or imported in found or not path:
+                continue
+
+            found[imported] = path.read_bytes()
+            try:
+                queue.append((imported, path.name == "__init__.py", ast.parse(found[imported])))
+            except SyntaxError:
+                pass
+
+    return found
+
+
+def cache_entry(digest):
+    directory = os.environ.get("SERVERLESS_BUILDER_RENDER_CACHE")
+
+    return Path(directory).joinpath(f"appsync-{digest}.json") if directory else None
+
+
+def discover(module_name, variable_name="app", mode="import"):
+    """
+    Returns resolver and batch resolver names registered on the AppSyncResolver of a handler module, or None when
+    the module has no such app. In ast mode source is parsed without importing the module (and whatever it imports
+    at module level), results are cached by source hash in memory and in the render cache directory. Handlers
+    importing local modules (which may register resolvers on the app as a side effect) and modules registering
+    resolvers dynamically (routers, computed names) are imported instead, the cache key then covers sources of
+    every imported local module.
+    """
+    spec = importlib.util.find_spec(module_name) if mode == "ast" else None
+    if not spec or not spec.origin or not spec.origin.endswith(".py"):
+        return import_registrations(module_name, variable_name)
+
+    source = Path(spec.origin).read_bytes()
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return import_registrations(module_name, variable_name)
+
+    modules = local_modules(spec.origin, module_name, tree)
+
+    digest = hashlib.sha256(variable_name.encode("utf-8") + b"\0" + source)
+    for name, module_source in sorted(modules.items()):
+        digest.update(b"\0" + name.encode("utf-8") + b"\0" + module_source)
+
+    digest = digest.hexdigest()
+    if digest in _cache:
+        return _cache[digest]
+
+    entry = cache_entry(digest)
+    if entry and entry.exists():
+        _cache[digest] = json.loads(entry.read_text())
+
+        return _cache[digest]
+
+    try:
+        if modules:
+            raise StaticDiscoveryException(f"{module_name} imports local modules: {', '.join(sorted(modules))}")
+
+        registrations = parse_registrations(tree, variable_name)
+    except StaticDiscoveryException:
+        registrations = import_registrations(module_name, variable_name)
+
+    _cache[digest] = registrations
+    if entry:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        entry.write_text(json.dumps(registrations))
+
+    return registrations
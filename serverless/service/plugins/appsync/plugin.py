@@ -1,5 +1,7 @@
+from pathlib import Path
 from typing import List, Union
 
+from serverless.service.plugins.appsync.templates import MappingTemplate, TemplateRegistry
 from serverless.service.plugins.generic import Generic
 from serverless.service.types import YamlOrderedDict
 
@@ -21,14 +23,71 @@ class CognitoAuthentication(YamlOrderedDict):
         self.config = {"userPoolId": user_pool}
 
 
+class Caching(YamlOrderedDict):
+    """
+    API cache. With PER_RESOLVER_CACHING only resolvers with caching configured are cached, FULL_REQUEST_CACHING
+    caches every resolver by its arguments and identity.
+    """
+
+    yaml_tag = "!AppSyncCaching"
+
+    PER_RESOLVER = "PER_RESOLVER_CACHING"
+    FULL_REQUEST = "FULL_REQUEST_CACHING"
+
+    def __init__(
+        self, behavior=PER_RESOLVER, type="SMALL", ttl=3600, at_rest_encryption=False, transit_encryption=False
+    ):
+        super().__init__()
+        if behavior not in (self.PER_RESOLVER, self.FULL_REQUEST):
+            raise ValueError(f"Unsupported caching behavior: {behavior}")
+
+        self.behavior = behavior
+        self.type = type
+        self.ttl = ttl
+        self.atRestEncryption = at_rest_encryption
+        self.transitEncryption = transit_encryption
+
+
+class ResolverCaching(YamlOrderedDict):
+    """
+    Resolver cache, keyed by $context.arguments and $context.identity fields, e.g.
+    ResolverCaching(ttl=300, arguments=["id"], identity=["sub"]).
+    """
+
+    yaml_tag = "!AppSyncResolverCaching"
+
+    def __init__(self, ttl=None, arguments=None, identity=None, keys=None):
+        super().__init__()
+        keys = [
+            *(f"$context.arguments.{argument}" for argument in arguments or []),
+            *(f"$context.identity.{field}" for field in identity or []),
+            *(keys or []),
+        ]
+
+        if ttl is not None:
+            self.ttl = ttl
+
+        if keys:
+            self.keys = keys
+
+
 class ResolverExtra(object):
-    def __init__(self, resolver, prefix=False, max_batch_size=None, request=None, response=None):
+    def __init__(
+        self,
+        resolver,
+        prefix=False,
+        max_batch_size=None,
+        request: Union[str, MappingTemplate, None] = None,
+        response: Union[str, MappingTemplate, None] = None,
+        caching: Union[ResolverCaching, bool, None] = None,
+    ):
         super().__init__()
         self.resolver = resolver
         self.prefix = prefix
         self.max_batch_size = max_batch_size
         self.request = request
         self.response = response
+        self.caching = caching
 
 
 class AppSync(Generic):
@@ -50,6 +109,8 @@ class AppSync(Generic):
         namespace_excluded=None,
         include_top_namespace_resolver=True,
         resolver_extras: Union[List[ResolverExtra], None] = None,
+        discovery="import",
+        caching: Union[Caching, None] = None,
         **kwargs
     ):
         super().__init__("serverless-appsync-plugin")
@@ -59,8 +120,11 @@ class AppSync(Generic):
         self.xrayEnabled = xray
         self.dataSources = data_sources or {}
         self.resolvers = resolvers or {}
+        self.caching = caching
         self.namespace = namespace
         self.resolver_extras = resolver_extras or []
+        self.discovery = discovery
+        self.templates = TemplateRegistry()
         self.update(kwargs)
         self.topNamespaceResolver = include_top_namespace_resolver
 
@@ -70,5 +134,15 @@ class AppSync(Generic):
         export.pop("namespace")
         export.pop("resolver_extras")
         export.pop("topNamespaceResolver")
+        export.pop("discovery")
+        export.pop("templates")
+
+        if export["caching"] is None:
+            export.pop("caching")
 
         service.appSync = export
+
+    def pre_render(self, service):
+        import __main__ as main
+
+        self.templates.write(Path(main.__file__).parent)
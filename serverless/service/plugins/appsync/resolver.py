@@ -1,3 +1,4 @@
+import warnings
 from typing import get_args, get_origin
 
 import strawberry
@@ -24,13 +25,12 @@ class GraphQLTypes(object):
         setattr(cls, name, field)
         cls.__annotations__[name] = type_hint
 
-
-class Query(GraphQLTypes):
-    pass
-
-
-class Mutation(GraphQLTypes):
-    pass
+    @classmethod
+    def create(cls, name):
+        """
+        Creates a new, empty type, so fields added while building one schema never leak into another.
+        """
+        return type(name, (cls,), {"__annotations__": {}})
 
 
 class Resolver(object):
@@ -51,10 +51,17 @@ class Resolver(object):
 
 
 class ResolverManager(object):
+    """
+    Collects resolvers of a single schema. Root and namespace types are created per manager, so schemas can be
+    built one after another or concurrently within a single process.
+    """
+
     def __init__(self, builder):
         self.builder = builder
         self._queries = {}
         self._mutations = {}
+        self.Query = GraphQLTypes.create("Query")
+        self.Mutation = GraphQLTypes.create("Mutation")
 
     def register(self, resolver):
         if resolver.type.upper().endswith("MUTATION"):
@@ -68,10 +75,10 @@ class ResolverManager(object):
         if len(parts) > 2:
             raise Exception("Only two levels of nesting are supported")
 
-        scope_type = type(Identifier(f"{parts[0]}{namespace_type}").pascal, (GraphQLTypes,), {})
+        scope_type = GraphQLTypes.create(Identifier(f"{parts[0]}{namespace_type}").pascal)
 
         if len(parts) == 2:
-            sub_scope_type = type(Identifier(f"{parts[1]}{namespace_type}").pascal, (GraphQLTypes,), {})
+            sub_scope_type = GraphQLTypes.create(Identifier(f"{parts[1]}{namespace_type}").pascal)
             scope_type.add(self.builder, parts[1], {}, strawberry.type(sub_scope_type))
 
             return scope_type, sub_scope_type
@@ -82,7 +89,7 @@ class ResolverManager(object):
         if not self._queries:
             return None
 
-        container_type = Query
+        container_type = self.Query
         if namespace:
             scope, container_type = self._build_namespace(namespace, "Query")
 
@@ -97,18 +104,18 @@ class ResolverManager(object):
 
         if namespace:
             parts = namespace.split(".")
-            Query.add(self.builder, parts[0], {}, strawberry.type(scope))
+            self.Query.add(self.builder, parts[0], {}, strawberry.type(scope))
 
             if len(parts) == 2:
                 scope.add(self.builder, parts[1], {}, strawberry.type(container_type))
 
-        return strawberry.type(Query)
+        return strawberry.type(self.Query)
 
     def mutations(self, namespace=None):
         if not self._mutations:
             return None
 
-        container_type = Mutation
+        container_type = self.Mutation
         if namespace:
             scope, container_type = self._build_namespace(namespace, "Mutation")
 
@@ -119,9 +126,27 @@ class ResolverManager(object):
 
         if namespace:
             parts = namespace.split(".")
-            Mutation.add(self.builder, parts[0], {}, strawberry.type(scope))
+            self.Mutation.add(self.builder, parts[0], {}, strawberry.type(scope))
 
             if len(parts) == 2:
                 scope.add(self.builder, parts[1], {}, strawberry.type(container_type))
 
-        return strawberry.type(Mutation)
+        return strawberry.type(self.Mutation)
+
+
+# Root types of builders used to be module level and shared by every schema. They are kept as deprecated aliases
+# of the default manager's types, builders create their own and never populate these.
+_default = ResolverManager(None)
+
+
+def __getattr__(name):
+    if name in ("Query", "Mutation"):
+        warnings.warn(
+            f"{__name__}.{name} is deprecated, root types are created per ResolverManager",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+        return getattr(_default, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,85 @@
+import hashlib
+from pathlib import Path
+
+BATCH_RESPONSE = "$util.toJson($context.result)"
+
+MUTATION_RESPONSE = """
+#if (!$util.isNull($ctx.error))
+  $util.error(
+    $util.defaultIfNull($ctx.error.message, "UnhandledError"),
+    $util.defaultIfNull($ctx.error.type, "Lambda:Unhandled"),
+    $util.defaultIfNull($ctx.error.data, {}),
+    $util.defaultIfNull($ctx.error.errorInfo, {})
+  )
+#end
+
+#if (!$util.isNull($ctx.result) && !$util.isNull($ctx.result.error))
+  $util.error(
+    $util.defaultIfNull($ctx.result.error.message, "UnknownError"),
+    $util.defaultIfNull($ctx.result.error.type, "BadRequest"),
+    $util.defaultIfNull($ctx.result.error.data, {}),
+    $util.defaultIfNull($ctx.result.error.info, {})
+  )
+#end
+
+$util.toJson($ctx.result)
+""".strip()
+
+
+class DuplicateTemplateException(Exception):
+    pass
+
+
+class MappingTemplate:
+    """
+    Inline VTL mapping template, e.g. ResolverExtra("Query.getItem", request=MappingTemplate("...")).
+    Written next to serverless.yml under a name derived from its content, unless a name is given.
+    """
+
+    def __init__(self, content, name=None):
+        self.content = content
+        self.name = name or f"template.{hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]}.vtl"
+
+
+class TemplateRegistry:
+    """
+    Mapping templates used by AppSync resolvers. Every distinct template is written once per render, and only
+    when file content differs, so unchanged templates keep their modification time.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._written = {}
+
+    def add(self, template):
+        if self._templates.get(template.name, template.content) != template.content:
+            raise DuplicateTemplateException(f"Template {template.name} is already registered with other content")
+
+        self._templates[template.name] = template.content
+
+        return template.name
+
+    def reference(self, template):
+        """
+        Returns file name to use in resolver definition, registering inline templates.
+        """
+        if isinstance(template, MappingTemplate):
+            return self.add(template)
+
+        return template
+
+    def write(self, directory):
+        written = []
+
+        for name, content in self._templates.items():
+            path = Path(directory).absolute().joinpath(name)
+            if self._written.get(path) == content:
+                continue
+
+            if not path.exists() or path.read_text() != content:
+                path.write_text(content)
+                written.append(path)
+
+            self._written[path] = content
+
+        return written
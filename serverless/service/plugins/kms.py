@@ -17,15 +17,13 @@ class KMSGrant(Generic):
 
     def pre_render(self, service):
         if service.plugins.get(IAMRoles):
-            for fn in service.functions.all():
-                service.custom["kmsGrants"].append(
-                    dict(
-                        kmsKeyId=EncryptableResource.encryption_alias(),
-                        roleName=fn.iam.role,
-                    )
-                )
-
+            roles = [fn.iam.role for fn in service.functions.all()]
         else:
-            service.custom["kmsGrants"].append(
-                dict(kmsKeyId=EncryptableResource.encryption_alias(), roleName=service.provider.iam.role)
-            )
+            roles = [service.provider.iam.role]
+
+        grants = service.custom["kmsGrants"]
+        granted = {(grant["kmsKeyId"], grant["roleName"]) for grant in grants}
+
+        for role in roles:
+            if (EncryptableResource.encryption_alias(), role) not in granted:
+                grants.append(dict(kmsKeyId=EncryptableResource.encryption_alias(), roleName=role))
@@ -0,0 +1,25 @@
+from serverless.service.plugins.generic import Generic
+
+
+class SplitStacks(Generic):
+    """
+    Plugin npm: https://www.npmjs.com/package/serverless-plugin-split-stacks
+
+    Moves resources into nested stacks and rewrites references between them. Changing the strategy or
+    nestedStackCount of a deployed service moves resources between stacks, so pick them once.
+    """
+
+    yaml_tag = "!SplitStacksPlugin"
+
+    def __init__(self, perFunction=False, perType=False, perGroupFunction=True, nestedStackCount=10):
+        super().__init__("serverless-plugin-split-stacks")
+        self.perFunction = perFunction
+        self.perType = perType
+        self.perGroupFunction = perGroupFunction
+        self.nestedStackCount = nestedStackCount
+
+    def enable(self, service):
+        export = dict(self)
+        export.pop("name", None)
+
+        service.custom.splitStacks = export
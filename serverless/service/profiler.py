@@ -0,0 +1,57 @@
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler:
+    """
+    Collects call counts and durations of render phases. Disabled profiler measures nothing, so instrumented
+    code paths cost a single attribute check.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.created = time.perf_counter()
+        self.timings = {}
+        self.counts = {}
+
+    def measure(self, name):
+        return self.timer(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, duration):
+        count, total = self.timings.get(name, (0, 0.0))
+        self.timings[name] = (count + 1, total + duration)
+
+    def count(self, name, value):
+        self.counts[name] = value
+
+    def report(self):
+        return dict(
+            counts=self.counts,
+            timings=[dict(name=name, count=count, total=total) for name, (count, total) in self.timings.items()],
+        )
+
+    def table(self):
+        width = max([len(name) for name in self.timings] + [5])
+        lines = [f"{'phase':<{width}}{'count':>8}{'total ms':>12}{'mean ms':>12}"]
+        for name, (count, total) in self.timings.items():
+            lines.append(f"{name:<{width}}{count:>8}{total * 1000:>12.2f}{total * 1000 / count:>12.2f}")
+
+        lines += [f"{name:<{width}}{value:>8}" for name, value in self.counts.items()]
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, stream=sys.stderr):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+        stream.write(self.table())
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Union
 
 import troposphere.ssm as ssm
@@ -13,6 +14,34 @@ class Condition:
         self.cond = cond
 
 
+class DuplicateResourceException(Exception):
+    pass
+
+
+class ResourceView(Sequence):
+    """
+    Read-only, live view of managed resources. Mutating it raises, resources are added and removed through
+    ResourceManager, which keeps its indexes in sync.
+    """
+
+    def __init__(self, resources):
+        self._resources = resources
+
+    def __len__(self):
+        return len(self._resources)
+
+    def __iter__(self):
+        return iter(self._resources.values())
+
+    def __getitem__(self, index):
+        return list(self._resources.values())[index]
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Resources are read-only, use ResourceManager.add(), replace() or remove() instead")
+
+    append = extend = insert = remove = pop = clear = __setitem__ = __delitem__ = __iadd__ = _readonly
+
+
 class ResourceManager(yaml.YAMLObject):
     yaml_tag = "!Resources"
 
@@ -20,7 +49,8 @@ class ResourceManager(yaml.YAMLObject):
         super().__init__()
         self.description = description
         self._service = service
-        self.resources = []
+        self._resources = {}
+        self._types = {}
         self.conditions = []
         self.outputs = {}
 
@@ -33,10 +63,50 @@ class ResourceManager(yaml.YAMLObject):
             for preset in resource.permissions():
                 self._service.provider.iam.apply(preset)
         else:
-            self.resources.append(resource)
+            existing = self._resources.get(resource.title)
+            if existing is not None:
+                if existing is not resource and existing.to_dict() != resource.to_dict():
+                    raise DuplicateResourceException(f"Resource {resource.title} is already defined")
+
+                return existing
+
+            self._resources[resource.title] = resource
+            self._index(resource)
 
         return resource
 
+    def replace(self, resource: AWSObject):
+        """
+        Swaps resource with the same title for the given one, keeping its position in the template.
+        """
+        existing = self._resources.get(resource.title)
+        if existing is not None:
+            self._unindex(existing)
+
+        self._resources[resource.title] = resource
+        self._index(resource)
+
+        return resource
+
+    def remove(self, resource: AWSObject):
+        del self._resources[resource.title]
+        self._unindex(resource)
+
+    def get(self, title):
+        return self._resources.get(title)
+
+    def by_type(self, cls):
+        return list(self._types.get(cls, {}).values())
+
+    # troposphere hashes objects by serialising them, so secondary indexes are keyed by identity
+    def _index(self, resource):
+        for cls in type(resource).__mro__:
+            self._types.setdefault(cls, {})[id(resource)] = resource
+
+    def _unindex(self, resource):
+        for cls in type(resource).__mro__:
+            self._types[cls].pop(id(resource), None)
+
     def add_condition(self, resource: Union[AWSObject]):
         self.conditions.append(resource)
 
@@ -46,6 +116,10 @@ class ResourceManager(yaml.YAMLObject):
         for resource in resources:
             self.add(resource)
 
+    @property
+    def resources(self):
+        return ResourceView(self._resources)
+
     def all(self):
         return self.resources
 
@@ -61,21 +135,22 @@ class ResourceManager(yaml.YAMLObject):
         return self.output(output_name, name, value, append, export=True)
 
     def parameter(self, resource_id, name, value, type="String"):
-        param = self.add(
-            ssm.Parameter(resource_id, Name=f"/services/${{self:service}}/${{sls:stage}}/{name}", Type=type, Value="")
+        param = ssm.Parameter(
+            resource_id, Name=f"/services/${{self:service}}/${{sls:stage}}/{name}", Type=type, Value=""
         )
         param.properties.__setitem__("Value", value)
 
-        return param
+        return self.add(param)
 
     @classmethod
     def to_yaml(cls, dumper, data):
+        with data._service.profiler.measure("serialise.resources.to_dict"):
+            resources = {title: resource.to_dict() for title, resource in data._resources.items()}
+
         return dumper.represent_dict(
             dict(
                 Description=data.description,
-                Resources={
-                    resource.title: resource.to_dict() for resource in data.resources
-                },
+                Resources=resources,
                 Conditions={
                     condition.title: condition.cond.to_dict()
                     for condition in data.conditions
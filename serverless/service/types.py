@@ -1,11 +1,83 @@
 import abc
 import hashlib
+import json
 import re
 from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache
 
 import inflection
 import yaml
 
+try:
+    from yaml import CDumper as BaseDumper
+except ImportError:
+    from yaml import Dumper as BaseDumper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Dumper(BaseDumper):
+    """
+    Uses libyaml emitter when PyYAML was built with it. yaml.YAMLObject subclasses register their representers
+    on yaml.Dumper only, so the whole set is mirrored here before every dump.
+    """
+
+    @classmethod
+    def sync(cls):
+        cls.yaml_representers = dict(yaml.Dumper.yaml_representers)
+        cls.yaml_multi_representers = dict(yaml.Dumper.yaml_multi_representers)
+
+        return cls
+
+
+class PlainRepresenter:
+    """
+    Stands in for yaml dumper when calling to_yaml representers, so they return plain python data
+    instead of YAML nodes.
+    """
+
+    def represent_dict(self, data):
+        return {key: to_plain(value) for key, value in data.items()}
+
+    def represent_list(self, data):
+        return [to_plain(item) for item in data]
+
+    def represent_str(self, data):
+        return str(data)
+
+
+def to_plain(value):
+    """
+    Converts service objects into dicts, lists and scalars, reusing to_yaml representers and troposphere to_dict.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+
+    if isinstance(value, yaml.YAMLObject):
+        return type(value).to_yaml(PlainRepresenter(), value)
+
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple, set)):
+        return [to_plain(item) for item in value]
+
+    if hasattr(value, "to_dict"):
+        return to_plain(value.to_dict())
+
+    raise TypeError(f"Object of type {type(value).__name__} can not be rendered")
+
+
+def dumps_json(data):
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
 
 class YamlOrderedDict(OrderedDict, yaml.YAMLObject):
     yaml_tag = "!YamlOrderedDict"
@@ -21,6 +93,26 @@ class YamlOrderedDict(OrderedDict, yaml.YAMLObject):
         return dumper.represent_dict(data)
 
 
+class TypeIndex:
+    """
+    Maps every class in the MRO of added objects to the first object of that class, so isinstance-style
+    lookups are a single dict access. Objects are expected to be only ever added, never removed.
+    """
+
+    def __init__(self):
+        self._types = {}
+
+    def add(self, obj):
+        for cls in type(obj).__mro__:
+            self._types.setdefault(cls, obj)
+
+    def get(self, cls):
+        return self._types.get(cls)
+
+    def __contains__(self, cls):
+        return cls in self._types
+
+
 class SmartString:
     def __init__(self, val, prefix="", suffix=""):
         self.val = val
@@ -37,8 +129,47 @@ class SmartString:
         return SmartString(self.val, prefix=prefix, suffix=suffix)
 
 
+@lru_cache(maxsize=None)
+def underscore(identifier):
+    return inflection.underscore(identifier)
+
+
+@lru_cache(maxsize=None)
+def camel_case(identifier):
+    return inflection.camelize(underscore(identifier))
+
+
+@lru_cache(maxsize=None)
+def pascal_case(identifier):
+    return inflection.camelize(underscore(identifier), uppercase_first_letter=True).replace("_", "")
+
+
+@lru_cache(maxsize=None)
+def snake_case(identifier):
+    return underscore(identifier).lower()
+
+
+@lru_cache(maxsize=None)
+def spinal_case(identifier):
+    return inflection.dasherize(underscore(identifier)).lower()
+
+
+@lru_cache(maxsize=None)
+def resource_case(identifier):
+    identifier = re.sub(r"\${.*?}-?", "", identifier)
+    identifier = re.sub(r"\W", "-", identifier)
+    identifier = identifier.strip("-")
+    return inflection.camelize(underscore(identifier), uppercase_first_letter=True)
+
+
 class Identifier(yaml.YAMLObject):
+    """
+    Immutable name with case conversions. Conversions are cached per identifier string, so every Identifier
+    created for the same name shares them.
+    """
+
     yaml_tag = "Identifier"
+    __slots__ = ("_identifier",)
 
     def __init__(self, identifier, safe=False):
         super().__init__()
@@ -46,33 +177,34 @@ class Identifier(yaml.YAMLObject):
             identifier = re.sub(r"\${.*?}-?", "", identifier)
             identifier = re.sub(r"\W", "-", identifier)
 
-        self.identifier = identifier
+        self._identifier = identifier
+
+    @property
+    def identifier(self):
+        return self._identifier
 
     @property
     def camel(self):
-        return inflection.camelize(inflection.underscore(self.identifier))
+        return camel_case(self._identifier)
 
     @property
     def pascal(self):
-        return inflection.camelize(inflection.underscore(self.identifier), uppercase_first_letter=True).replace("_", "")
+        return pascal_case(self._identifier)
 
     @property
     def snake(self):
-        return inflection.underscore(self.identifier).lower()
+        return snake_case(self._identifier)
 
     @property
     def spinal(self):
-        return inflection.dasherize(inflection.underscore(self.identifier)).lower()
+        return spinal_case(self._identifier)
 
     @property
     def resource(self):
-        identifier = re.sub(r"\${.*?}-?", "", self.identifier)
-        identifier = re.sub(r"\W", "-", identifier)
-        identifier = identifier.strip("-")
-        return inflection.camelize(inflection.underscore(identifier), uppercase_first_letter=True)
+        return resource_case(self._identifier)
 
     def __str__(self):
-        return self.identifier
+        return self._identifier
 
     @classmethod
     def to_yaml(cls, dumper, data):
@@ -0,0 +1,184 @@
+import os
+import re
+
+import yaml
+
+# Innermost variable, i.e. one that does not contain other variables
+VARIABLE = re.compile(r"\$\{([^${}]*)\}")
+MARKER = re.compile(r"\x00(\d+)\x00")
+
+# Sources resolved by the framework at deploy time only, a fallback after them cannot be picked at build time
+DYNAMIC = object()
+MISSING = object()
+MAX_DEPTH = 20
+
+
+def load_variables(directory, stage, advanced=False):
+    """
+    Loads stage variables the same way custom.vars does: variables.yml, merged with variables_${APP_NAME}.yml
+    when advanced variables are enabled.
+    """
+    files = ["variables.yml"]
+    if advanced and "APP_NAME" in os.environ:
+        files.append(f"variables_{os.environ['APP_NAME']}.yml")
+
+    variables = {}
+    for name in files:
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            continue
+
+        with open(path) as f:
+            variables.update((yaml.safe_load(f) or {}).get(stage) or {})
+
+    return variables
+
+
+def alternatives(expression):
+    """
+    Splits variable expression into comma separated alternatives, commas inside quoted fallbacks are kept.
+    """
+    parts, current, quote = [], [], None
+    for char in expression:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+
+        current.append(char)
+
+    return [*parts, "".join(current)]
+
+
+class Resolver:
+    """
+    Substitutes serverless framework variables with values known at build time. Variables using other sources
+    (ssm, cf, s3, file...) are left for the framework, together with every variable that depends on them.
+    """
+
+    def __init__(self, document, stage, region, account_id=None, environ=None):
+        self.document = document
+        self.sources = {
+            "sls:stage": stage,
+            "opt:stage": stage,
+            "aws:region": region,
+            "opt:region": region,
+        }
+        if account_id:
+            self.sources["aws:accountId"] = str(account_id)
+
+        self.environ = os.environ if environ is None else environ
+
+    def lookup(self, path):
+        value = self.document
+        for part in path.split("."):
+            if isinstance(value, str) and VARIABLE.search(value):
+                value = self.string(value)
+
+            if isinstance(value, str) and VARIABLE.search(value):
+                return DYNAMIC
+
+            if not isinstance(value, dict) or part not in value:
+                return MISSING
+
+            value = value[part]
+
+        return value
+
+    def source(self, expression):
+        expression = expression.strip()
+        if expression in self.sources:
+            return self.sources[expression]
+
+        if expression.startswith("self:"):
+            return self.lookup(expression[5:])
+
+        if expression.startswith("env:"):
+            return self.environ.get(expression[4:], MISSING)
+
+        if len(expression) > 1 and expression[0] == expression[-1] and expression[0] in "'\"":
+            return expression[1:-1]
+
+        if re.fullmatch(r"-?\d+", expression):
+            return int(expression)
+
+        if re.fullmatch(r"-?\d+\.\d+", expression):
+            return float(expression)
+
+        return DYNAMIC
+
+    def variable(self, expression):
+        """
+        Resolves a variable with optional comma separated fallbacks, returns DYNAMIC when it cannot be resolved.
+        """
+        if MARKER.search(expression):
+            return DYNAMIC
+
+        for alternative in alternatives(expression):
+            value = self.source(alternative)
+            if value is not MISSING:
+                return value
+
+        return DYNAMIC
+
+    def string(self, value, depth=0):
+        kept = []
+
+        def substitute(match):
+            resolved = self.variable(match.group(1))
+            if resolved is DYNAMIC:
+                kept.append(match.group(0))
+                return f"\x00{len(kept) - 1}\x00"
+
+            return str(resolved)
+
+        for _ in range(MAX_DEPTH - depth):
+            whole = VARIABLE.fullmatch(value)
+            if whole:
+                # Single variable pointing to a number, list or mapping keeps its type
+                resolved = self.variable(whole.group(1))
+                if resolved is not DYNAMIC and not isinstance(resolved, str):
+                    return self.resolve(resolved, depth + 1)
+
+            if not VARIABLE.search(value):
+                break
+
+            value = VARIABLE.sub(substitute, value)
+        else:
+            raise RecursionError(f"Circular variable reference in {value}")
+
+        while MARKER.search(value):
+            value = MARKER.sub(lambda match: kept[int(match.group(1))], value)
+
+        return value
+
+    def resolve(self, value, depth=0):
+        if isinstance(value, str):
+            return self.string(value, depth)
+
+        if isinstance(value, dict):
+            return {self.resolve(key, depth): self.resolve(item, depth) for key, item in value.items()}
+
+        if isinstance(value, list):
+            return [self.resolve(item, depth) for item in value]
+
+        return value
+
+
+def resolve(document, stage, region, account_id=None, variables=None, environ=None):
+    """
+    Returns a copy of the plain service definition with build time resolvable variables substituted.
+    Stage variables replace custom.vars, so ${self:custom.vars...} references are resolved as well.
+    """
+    document = dict(document)
+    document["provider"] = dict(document.get("provider") or {}, stage=stage, region=region)
+
+    if variables is not None:
+        custom = {key: value for key, value in (document.get("custom") or {}).items() if key != "var_files"}
+        document["custom"] = dict(custom, vars=variables)
+
+    return Resolver(document, stage, region, account_id, environ).resolve(document)
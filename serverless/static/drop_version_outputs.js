@@ -0,0 +1,9 @@
+// Removes <Function>LambdaFunctionQualifiedArn outputs added by serverless framework for every function version,
+// keeping large services under CloudFormation outputs limit.
+const outputs = serverless.service.provider.compiledCloudFormationTemplate.Outputs || {};
+
+for (const name of Object.keys(outputs)) {
+    if (name.endsWith('LambdaFunctionQualifiedArn')) {
+        delete outputs[name];
+    }
+}